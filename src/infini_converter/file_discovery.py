@@ -3,13 +3,56 @@ File discovery and management utilities
 """
 
 import os
-import glob
+import time
 from pathlib import Path
 from typing import List, Optional
 
+# Number of searches whose results are kept
+_CACHE_SIZE = 32
+
+# Directories modified this recently can still change within the same timestamp
+# tick, so results covering them are not cached
+_RACY_WINDOW_NS = 1000000000
+
 class FileDiscovery:
     def __init__(self, extensions: List[str] = None):
         self.extensions = extensions or [".txt", ".csv", ".json", ".xml", ".log"]
+        # (directory, extensions) -> (directory mtime_ns, sorted file list), flat searches only
+        self._cache = {}
+    
+    @staticmethod
+    def _walk(directory: str, recursive: bool, extensions: tuple) -> List[str]:
+        """
+        List the files below a directory whose names end in one of the extensions.
+        
+        One scandir pass covers all extensions; DirEntry answers is_dir/is_file
+        from the directory listing, so entries are not stat'ed one by one.
+        Hidden entries are skipped, matching glob's shell-style patterns.
+        
+        Args:
+            directory: Directory to search
+            recursive: Whether to search subdirectories
+            extensions: File extensions to match, case-sensitively
+            
+        Returns:
+            Unsorted list of file paths
+        """
+        files = []
+        pending = [directory]
+        while pending:
+            current = pending.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        if entry.name.startswith('.'):
+                            continue
+                        if recursive and entry.is_dir():
+                            pending.append(entry.path)
+                        elif entry.name.endswith(extensions) and entry.is_file():
+                            files.append(entry.path)
+            except OSError:
+                continue
+        return files
     
     def find_files(self, directory: str, recursive: bool = True) -> List[str]:
         """
@@ -25,19 +68,34 @@ class FileDiscovery:
         if not os.path.exists(directory):
             return []
         
-        files = []
-        
-        for ext in self.extensions:
-            if recursive:
-                pattern = os.path.join(directory, "**", f"*{ext}")
-                found_files = glob.glob(pattern, recursive=True)
-            else:
-                pattern = os.path.join(directory, f"*{ext}")
-                found_files = glob.glob(pattern)
-            
-            files.extend(found_files)
-        
-        return sorted(files)
+        extensions = tuple(self.extensions)
+        if recursive:
+            # Proving a recursive result is still valid means listing every subdirectory,
+            # which costs as much as walking the tree again, so these are never cached
+            files = self._walk(directory, True, extensions)
+            files.sort()
+            return files
+        
+        # Adding, removing or renaming an entry updates the directory's mtime, so
+        # repeated flat searches of an unchanged directory are answered from the cache
+        key = (os.path.abspath(directory), extensions)
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            mtime = None
+        cached = self._cache.get(key)
+        if mtime is not None and cached and cached[0] == mtime:
+            return list(cached[1])
+        
+        files = self._walk(directory, False, extensions)
+        files.sort()
+        
+        if mtime is not None and mtime < time.time_ns() - _RACY_WINDOW_NS:
+            if key not in self._cache and len(self._cache) >= _CACHE_SIZE:
+                self._cache.pop(next(iter(self._cache)))
+            self._cache[key] = (mtime, tuple(files))
+        
+        return files
     
     def set_extensions(self, extensions: List[str]) -> None:
         """
@@ -114,10 +172,13 @@ class FileDiscovery:
         filtered = []
         
         for file_path in files:
-            if os.path.exists(file_path):
-                size = os.path.getsize(file_path)
-                if size >= min_size and (max_size is None or size <= max_size):
-                    filtered.append(file_path)
+            # One stat answers both whether the file exists and how large it is
+            try:
+                size = os.stat(file_path).st_size
+            except OSError:
+                continue
+            if size >= min_size and (max_size is None or size <= max_size):
+                filtered.append(file_path)
         
         return filtered
     
@@ -136,10 +197,12 @@ class FileDiscovery:
         filtered = []
         
         for file_path in files:
-            if os.path.exists(file_path):
-                mod_time = os.path.getmtime(file_path)
-                if (start_date is None or mod_time >= start_date) and (end_date is None or mod_time <= end_date):
-                    filtered.append(file_path)
+            try:
+                mod_time = os.stat(file_path).st_mtime
+            except OSError:
+                continue
+            if (start_date is None or mod_time >= start_date) and (end_date is None or mod_time <= end_date):
+                filtered.append(file_path)
         
         return filtered
     
@@ -162,18 +225,17 @@ class FileDiscovery:
             # Skip files with problematic patterns
             is_problematic = any(pattern in filename for pattern in problematic_patterns)
             
-            # Also skip files that are too small (likely incomplete)
-            if os.path.exists(file_path):
-                try:
-                    size = os.path.getsize(file_path)
-                    is_too_small = size < 50  # Less than 50 bytes
-                except:
-                    is_too_small = True
-                
-                if not is_problematic and not is_too_small:
-                    filtered.append(file_path)
-                    print(f"Keeping file: {filename} (size={size}, problematic={is_problematic}, too_small={is_too_small})")
-                else:
-                    print(f"Skipping file: {filename} (size={size}, problematic={is_problematic}, too_small={is_too_small})")
+            # Also skip files that are too small (likely incomplete), missing files are dropped
+            try:
+                size = os.stat(file_path).st_size
+            except OSError:
+                continue
+            is_too_small = size < 50  # Less than 50 bytes
+            
+            if not is_problematic and not is_too_small:
+                filtered.append(file_path)
+                print(f"Keeping file: {filename} (size={size}, problematic={is_problematic}, too_small={is_too_small})")
+            else:
+                print(f"Skipping file: {filename} (size={size}, problematic={is_problematic}, too_small={is_too_small})")
         
         return filtered
\ No newline at end of file
@@ -89,6 +89,9 @@ class InfiniConverterGUI:
         self.show_command_confirm = tk.BooleanVar(value=self.config.is_command_confirm_enabled())
         self.selected_files = []
         self.processing_thread = None
+        # Latest progress update from the worker threads, applied by the Tk status loop
+        self._latest_progress = None
+        self._progress_lock = threading.Lock()
         
         self.setup_gui()
         self.load_initial_settings()
@@ -772,8 +775,7 @@ class InfiniConverterGUI:
             pre_files = []
             if os.path.exists(file_output_dir):
                 try:
-                    pre_files = [os.path.join(file_output_dir, f) for f in os.listdir(file_output_dir) 
-                                 if os.path.isfile(os.path.join(file_output_dir, f))]
+                    pre_files = self._list_files(file_output_dir)
                     print(f"Collected {len(pre_files)} pre-processing files from {file_output_dir}")
                 except Exception as e:
                     print(f"Error reading output directory {file_output_dir}: {e}")
@@ -816,8 +818,7 @@ class InfiniConverterGUI:
                 post_files = []
                 if os.path.exists(file_output_dir):
                     try:
-                        post_files = [os.path.join(file_output_dir, f) for f in os.listdir(file_output_dir) 
-                                     if os.path.isfile(os.path.join(file_output_dir, f))]
+                        post_files = self._list_files(file_output_dir)
                         print(f"Found {len(post_files)} files in output directory after processing")
                     except Exception as e:
                         print(f"Error reading output directory {file_output_dir}: {e}")
@@ -941,8 +942,7 @@ class InfiniConverterGUI:
         pre_files = []
         if output_dir and output_dir != output_placeholder_text and os.path.exists(output_dir):
             try:
-                pre_files = [os.path.join(output_dir, f) for f in os.listdir(output_dir) 
-                             if os.path.isfile(os.path.join(output_dir, f))]
+                pre_files = self._list_files(output_dir)
                 print(f"Collected {len(pre_files)} pre-processing files from output directory")
             except Exception as e:
                 print(f"Error reading output directory: {e}")
@@ -977,14 +977,20 @@ class InfiniConverterGUI:
         # Create progress callback for real-time updates
         def progress_callback(percentage, message):
             print(f"Real-time progress: {percentage:.1f}% - {message}")
-            self.progress_var.set(percentage)
-            self.status_var.set(f"Processing: {message}")
-            self.root.update_idletasks()
+            # Called from worker threads, which must not touch Tk; replace any update
+            # the status loop has not picked up yet
+            with self._progress_lock:
+                self._latest_progress = (percentage, message)
+        
+        # The completion callback also runs on the worker thread, so hand the
+        # results to the Tk main loop instead of updating widgets from there
+        def completion_callback(results):
+            self.root.after(0, self.processing_complete, results)
         
         # Start processing in a separate thread
         self.processing_thread = self.processor.process_files_async(
             files,
-            callback=self.processing_complete,
+            callback=completion_callback,
             progress_callback=progress_callback
         )
         
@@ -1017,6 +1023,14 @@ class InfiniConverterGUI:
             
             self.status_var.set(f"Processing: {os.path.basename(status['current_file'])} ({status['processed_count']}/{total})")
             
+            # Show the latest real-time update from the program output, if any
+            with self._progress_lock:
+                latest, self._latest_progress = self._latest_progress, None
+            if latest:
+                percentage, message = latest
+                self.progress_var.set(percentage)
+                self.status_var.set(f"Processing: {message}")
+            
             # Schedule next update
             self.root.after(200, self.update_processing_status)  # Increased interval to reduce CPU usage
         else:
@@ -1033,8 +1047,7 @@ class InfiniConverterGUI:
         
         if output_dir and output_dir != output_placeholder_text and os.path.exists(output_dir):
             try:
-                post_files = [os.path.join(output_dir, f) for f in os.listdir(output_dir) 
-                             if os.path.isfile(os.path.join(output_dir, f))]
+                post_files = self._list_files(output_dir)
                 print(f"Found {len(post_files)} files in output directory after processing")
             except Exception as e:
                 print(f"Error reading output directory: {e}")
@@ -1059,7 +1072,8 @@ class InfiniConverterGUI:
         # Display new files in output listbox with full paths
         self.output_listbox.delete(0, tk.END)
         if new_files:
-            for file_path in sorted(new_files):
+            new_files.sort()
+            for file_path in new_files:
                 # Display full path instead of just filename
                 self.output_listbox.insert(tk.END, file_path)
                 print(f"Added new file to output list: {file_path}")
@@ -1718,6 +1732,12 @@ class InfiniConverterGUI:
             print(f"Found additional output files in directory: {found_files}")
             output_files.extend(found_files)
     
+    @staticmethod
+    def _list_files(directory: str) -> List[str]:
+        """List the regular files in a directory using one scandir pass."""
+        with os.scandir(directory) as entries:
+            return [entry.path for entry in entries if entry.is_file()]
+    
     def _find_any_modified_files(self, output_files: list, original_files: list):
         """Find any files in output directory that weren't in original files."""
         output_dir = self.output_directory.get()
@@ -1728,9 +1748,9 @@ class InfiniConverterGUI:
         original_basenames = {os.path.basename(f) for f in original_files}
         
         # Look for any files that might be outputs
-        for item in os.listdir(output_dir):
-            item_path = os.path.join(output_dir, item)
-            if os.path.isfile(item_path) and item not in original_basenames:
+        for item_path in self._list_files(output_dir):
+            item = os.path.basename(item_path)
+            if item not in original_basenames:
                 # Check if it's likely an output file (not a script, config, etc.)
                 if not item.endswith(('.sh', '.bat', '.exe', '.py', '.conf', '.config')):
                     if item_path not in output_files:
@@ -4,9 +4,29 @@ Logging system for Infini Converter
 
 import logging
 import os
+import time
 from datetime import datetime
 from typing import Optional
 
+class _CachedTimeFormatter(logging.Formatter):
+    """Formatter that renders the date and time of each second only once."""
+    
+    def __init__(self, fmt: Optional[str] = None, datefmt: Optional[str] = None):
+        super().__init__(fmt, datefmt)
+        # (second, rendered timestamp) kept as one tuple so threads never see a torn pair
+        self._cached_time = (None, "")
+    
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        if datefmt:
+            return super().formatTime(record, datefmt)
+        
+        second = int(record.created)
+        cached_second, stamp = self._cached_time
+        if second != cached_second:
+            stamp = time.strftime(self.default_time_format, self.converter(record.created))
+            self._cached_time = (second, stamp)
+        return self.default_msec_format % (stamp, record.msecs)
+
 class Logger:
     def __init__(self, log_file: str = "infini_converter.log", enabled: bool = True):
         self.enabled = enabled
@@ -30,7 +50,7 @@ class Logger:
             console_handler = logging.StreamHandler()
             console_handler.setLevel(logging.INFO)
             
-            formatter = logging.Formatter(
+            formatter = _CachedTimeFormatter(
                 '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
             )
             file_handler.setFormatter(formatter)
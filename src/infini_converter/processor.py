@@ -2,17 +2,216 @@
 External program processing functionality
 """
 
+import bisect
+import codecs
+import concurrent.futures
+import functools
 import os
+import queue
+import re
+import selectors
+import shlex
+import shutil
+import stat
 import subprocess
 from typing import List, Dict, Any
 import threading
 import time
 
+# Stand-ins used while tokenizing a command template, so that the real
+# program and paths are never re-split by shlex
+_PROGRAM_TOKEN = "\x00PROGRAM\x00"
+_INPUT_TOKEN = "\x00INPUT\x00"
+_OUTPUT_TOKEN = "\x00OUTPUT\x00"
+_TOKEN_RE = re.compile(r'\x00(PROGRAM|INPUT|OUTPUT)\x00')
+
+# Runs of whitespace collapsed by normalize_file_path
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Shell escape sequences undone by normalize_file_path
+_ESCAPE_SEQUENCES = {
+    '\\ ': ' ',      # Escaped space
+    '\\\"': '"',     # Escaped double quote
+    "\\'": "'",      # Escaped single quote
+    '\\$': '$',      # Escaped dollar sign
+    '\\\\': '\\',    # Escaped backslash
+    '\\`': '`',      # Escaped backtick
+    '\\&': '&',      # Escaped ampersand
+    '\\|': '|',      # Escaped pipe
+    '\\;': ';',      # Escaped semicolon
+    '\\<': '<',      # Escaped less than
+    '\\>': '>',      # Escaped greater than
+    '\\(': '(',      # Escaped left parenthesis
+    '\\)': ')',      # Escaped right parenthesis
+    '\\{': '{',      # Escaped left brace
+    '\\}': '}',      # Escaped right brace
+    '\\[': '[',      # Escaped left bracket
+    '\\]': ']',      # Escaped right bracket
+    '\\*': '*',      # Escaped asterisk
+    '\\?': '?',      # Escaped question mark
+    '\\~': '~',      # Escaped tilde
+    '\\#': '#',      # Escaped hash
+    '\\!': '!',      # Escaped exclamation
+    '\\t': '\t',     # Escaped tab
+    '\\n': '\n',     # Escaped newline
+    '\\r': '\r',     # Escaped carriage return
+}
+# A backslash and the escaped character (captured); the captured characters are
+# mapped to what they stand for with one str.translate call
+_ESCAPE_RE = re.compile(r'\\([' + re.escape(''.join(seq[1] for seq in _ESCAPE_SEQUENCES)) + '])')
+_ESCAPE_TRANSLATION = str.maketrans({seq[1]: char for seq, char in _ESCAPE_SEQUENCES.items()})
+
+# Line endings in subprocess output, including the bare \r used by progress meters
+_NEWLINE_RE = re.compile(r'\r\n|\r|\n')
+
+# Progress found by _parse_progress_fast in a single scan. Every percentage form
+# ("progress: 50%", "50% done", ...) contains a bare number followed by %. The
+# count forms are "frame/processing/file/item/task N of M", "N / M" and "N out of M".
+_PROGRESS_RE = re.compile(
+    r'(?P<percentage>\d+)%'
+    r'|(?:(?:frame|processing|file|item|task)\s*(?P<named_current>\d+)\s*of'
+    r'|(?P<current>\d+)\s*(?:/|out\s*of))\s*(?P<total>\d+)',
+    re.IGNORECASE
+)
+_PERCENTAGE_RE = re.compile(r'(\d+)%')
+
+# Bytes requested per read from a subprocess pipe
+_READ_SIZE = 65536
+
+# Minimum seconds between two progress callbacks for the same file
+_PROGRESS_CALLBACK_INTERVAL = 0.1
+
+# Seconds between checks of the per-file deadline and the stop flag
+_POLL_INTERVAL = 0.1
+
+# Seconds a stopped program gets to exit after SIGTERM before it is killed
+_TERMINATE_GRACE = 2.0
+
+# Popen arguments that keep CPython on its posix_spawn() fast path, which avoids
+# copying the parent's page tables on every launch. It also needs an executable
+# with a directory part (see _resolve_executable). Passing preexec_fn, cwd,
+# pass_fds, start_new_session or close_fds=True silently falls back to fork+exec.
+# Python's own descriptors are non-inheritable (PEP 446), so close_fds=False is safe.
+_SPAWN_KWARGS = {} if os.name == 'nt' else {"close_fds": False}
+
+
+@functools.lru_cache(maxsize=32)
+def _resolve_executable(program: str, search_path: str = None) -> str:
+    """
+    Resolve a bare program name against PATH.
+    
+    Args:
+        program: Program as written in the command
+        search_path: PATH used for the child process
+        
+    Returns:
+        Path to the program, or None to let Popen resolve it
+    """
+    if os.name == 'nt' or os.path.dirname(program):
+        return None
+    return shutil.which(program, path=search_path)
+
+
+def _join_command(cmd_list: List[str]) -> str:
+    """
+    Join a command list into a line that a POSIX shell would split back into it.
+    
+    Equivalent to shlex.join, which needs Python 3.8.
+    
+    Args:
+        cmd_list: Command and its arguments
+        
+    Returns:
+        Command line with every argument quoted as needed
+    """
+    return " ".join(shlex.quote(arg) for arg in cmd_list)
+
+
+def _template_writes_stdout(template: str) -> bool:
+    """
+    Check whether a command template sends the program's result to stdout.
+    
+    Only explicit stdout targets count: "/dev/stdout", an option given "-"
+    ("-o -") or an option ending in "=-" ("--output=-"). A template that just
+    leaves the output location out may edit files in place or print progress.
+    
+    Args:
+        template: Command template with placeholders
+        
+    Returns:
+        True if the template names stdout as the output
+    """
+    if not template or "{output" in template:
+        return False
+    
+    try:
+        tokens = shlex.split(template, posix=(os.name != 'nt'))
+    except ValueError:
+        return False
+    
+    previous = ""
+    for token in tokens:
+        if token == "/dev/stdout" or token.endswith("=-"):
+            return True
+        if token == "-" and len(previous) > 1 and previous.startswith("-"):
+            return True
+        previous = token
+    return False
+
+
+@functools.lru_cache(maxsize=1024)
+def _unescape_path(file_path: str) -> str:
+    """
+    Undo shell escaping in a path and collapse runs of whitespace.
+    
+    Args:
+        file_path: Path as typed or pasted by the user
+        
+    Returns:
+        Path with escape sequences replaced by the actual characters
+    """
+    # Remove extra spaces from the path
+    normalized = file_path.strip()
+    
+    # Handle escape sequences - convert them to actual characters in a single pass.
+    # Splitting on the escapes puts the escaped characters at the odd indexes.
+    if '\\' in normalized:
+        parts = _ESCAPE_RE.split(normalized)
+        parts[1::2] = "".join(parts[1::2]).translate(_ESCAPE_TRANSLATION)
+        normalized = "".join(parts)
+    
+    # Replace multiple spaces with single space
+    return _WHITESPACE_RE.sub(' ', normalized)
+
+
+@functools.lru_cache(maxsize=128)
+def _is_executable(path: str, mtime_ns: int, mode: int) -> bool:
+    """
+    Check whether the current user may execute a file.
+    
+    The modification time and mode are only part of the cache key, so a
+    replaced or re-permissioned program is checked again.
+    
+    Args:
+        path: Path to the file
+        mtime_ns: File modification time in nanoseconds
+        mode: File mode bits
+        
+    Returns:
+        True if the file is executable
+    """
+    return os.access(path, os.X_OK)
+
+
+class _ProcessingStopped(Exception):
+    """Raised when a stop request interrupts a running program."""
+
+
 class FileProcessor:
     def __init__(self, processing_program: str = "", output_directory: str = "", command_template: str = "", env_vars: str = ""):
         self.processing_program = processing_program
         self.output_directory = output_directory
-        self.command_template = command_template
+        self.set_command_template(command_template)
         self.env_vars = env_vars
         self.processing_results = []
         self.is_processing = False
@@ -20,6 +219,15 @@ class FileProcessor:
         self.current_file = ""
         self.processed_count = 0
         self.failed_count = 0
+        self.per_file_timeout = 300
+        self.debug = False
+        # Files are independent, so a batch runs one program per CPU by default
+        self.max_workers = os.cpu_count() or 1
+        # Caches hold (signature, value) pairs so concurrent files never see a torn update
+        self._template_cache = (None, [])
+        self._env_cache = (None, None)
+        self._status_lock = threading.Lock()
+        self._dir_cache = {}
     
     def set_processing_program(self, program: str) -> None:
         """
@@ -48,6 +256,10 @@ class FileProcessor:
             template: Command template with placeholders {env}, {program}, {input}, {output_dir}
         """
         self.command_template = template
+        # Pick the command builder here rather than checking the template for every file
+        self._uses_template = bool(template) and not template.startswith("Use placeholders:")
+        self._render = self._render_template if self._uses_template else self._render_default
+        self._streams_stdout = self._uses_template and _template_writes_stdout(template)
     
     def set_env_vars(self, env_vars: str) -> None:
         """
@@ -58,117 +270,235 @@ class FileProcessor:
         """
         self.env_vars = env_vars
     
-    def is_placeholder_quoted(self, template: str, placeholder: str) -> bool:
+    def set_per_file_timeout(self, seconds: float) -> None:
         """
-        Check if a placeholder in a template is already quoted.
+        Set how long a single file may take before its program is killed.
         
         Args:
-            template: The command template
-            placeholder: The placeholder to check (e.g., '{input}')
+            seconds: Timeout in seconds
+        """
+        self.per_file_timeout = seconds
+    
+    def set_max_workers(self, workers: int) -> None:
+        """
+        Set how many files a batch may process at the same time.
+        
+        Args:
+            workers: Maximum number of concurrently running programs
+        """
+        self.max_workers = max(1, workers)
+    
+    def set_debug(self, enabled: bool) -> None:
+        """
+        Enable or disable echoing every line of program output to the console.
+        
+        Args:
+            enabled: Whether to print program output as it arrives
+        """
+        self.debug = enabled
+    
+    def escape_path_for_shell(self, path: str) -> str:
+        """
+        Quote a file path so it can be shown as part of a shell command line.
+        
+        Args:
+            path: The file path to quote
             
         Returns:
-            True if the placeholder is quoted, False otherwise
+            Quoted path safe to paste into a shell
         """
-        import re
+        if not path:
+            return path
         
-        # Find the placeholder in the template
-        placeholder_pos = template.find(placeholder)
-        if placeholder_pos == -1:
-            return False
+        return shlex.quote(path)
+    
+    def _template_tokens(self) -> List[str]:
+        """
+        Tokenize the command template once per configuration.
         
-        # Check for quotes before the placeholder
-        # Look for single or double quotes immediately before the placeholder
-        before_text = template[:placeholder_pos]
-        
-        # Check if there's a quote right before the placeholder
-        # Patterns like: "{input}", '{input}', "prefix{input}", 'prefix{input}'
-        patterns = [
-            r'\"' + re.escape(placeholder) + r'\"',  # "{placeholder}"
-            r"\'" + re.escape(placeholder) + r'\'',  # '{placeholder}'
-            r'\"[^\"]*' + re.escape(placeholder) + r'\"',  # "anything{placeholder}"
-            r"\'\[^\']*" + re.escape(placeholder) + r"\'",
-        ]
+        The template is tokenized while the program, input and output
+        placeholders still hold sentinel values, and the real values are
+        substituted into the tokens afterwards. A path containing spaces or
+        shell metacharacters therefore stays a single argument whether or not
+        its placeholder is quoted in the template.
         
-        for pattern in patterns:
-            if re.search(pattern, template):
-                return True
+        The result is cached against the template, program, output directory
+        and environment, so a batch only formats and splits the template once.
         
-        return False
+        Returns:
+            Template tokens with the program and output directory filled in
+            and the input still held by its sentinel
+        """
+        signature = (self.command_template, self.processing_program, self.output_directory, self.env_vars)
+        cached_signature, cached_tokens = self._template_cache
+        if cached_signature == signature:
+            return cached_tokens
+        
+        output_token = _OUTPUT_TOKEN if self.output_directory else ""
+        
+        # Format command template with error handling
+        try:
+            rendered = self.command_template.format(
+                env=self.env_vars,
+                program=_PROGRAM_TOKEN,
+                input=_INPUT_TOKEN,
+                output_dir=output_token
+            )
+        except KeyError as e:
+            # Handle missing placeholders gracefully
+            print(f"Warning: Command template missing placeholder {e}. Using fallback command.")
+            rendered = f"{self.env_vars} {_PROGRAM_TOKEN} {_INPUT_TOKEN} {output_token}"
+        except Exception as e:
+            print(f"Error formatting command template: {e}. Using fallback command.")
+            rendered = f"{self.env_vars} {_PROGRAM_TOKEN} {_INPUT_TOKEN} {output_token}"
+        
+        try:
+            tokens = shlex.split(rendered, posix=(os.name != 'nt'))
+        except ValueError as e:
+            print(f"Warning: Could not parse command template ({e}). Splitting on whitespace.")
+            tokens = rendered.split()
+        
+        program = self.processing_program.strip()
+        values = {
+            "PROGRAM": program,
+            "INPUT": _INPUT_TOKEN,
+            "OUTPUT": self.output_directory,
+        }
+        # Substitute all stand-ins in one pass, leaving plain tokens untouched.
+        # A bare {program} may carry its own arguments ("sed -E") and expands
+        # to several tokens, as it did when templates ran through a shell
+        expanded = []
+        for token in tokens:
+            if token == _PROGRAM_TOKEN:
+                expanded.extend(self._split_program(program))
+            elif "\x00" in token:
+                expanded.append(_TOKEN_RE.sub(lambda m: values[m.group(1)], token))
+            else:
+                expanded.append(token)
+        tokens = expanded
+        self._template_cache = (signature, tokens)
+        return tokens
     
-    def escape_path_for_shell(self, path: str, raw_escape: bool = False, already_quoted: bool = False) -> str:
+    @staticmethod
+    def _split_program(program: str) -> List[str]:
         """
-        Escape a file path for safe shell command execution.
+        Split a processing program setting into the program and its own arguments.
+        
+        A setting naming an existing file is kept whole, so a browsed path
+        containing spaces still runs.
         
         Args:
-            path: The file path to escape
-            raw_escape: If True, escape only the most dangerous characters without wrapping in quotes
-            already_quoted: If True, the path will be inside quotes in the template
+            program: Processing program as configured, e.g. "sed -E"
             
         Returns:
-            Escaped path safe for shell execution
+            Argument list starting with the program
         """
-        if not path:
-            return path
+        if not program or os.path.exists(program):
+            return [program]
+        try:
+            return shlex.split(program, posix=(os.name != 'nt')) or [program]
+        except ValueError:
+            return program.split() or [program]
+    
+    def _split_template(self, input_file: str) -> List[str]:
+        """
+        Render the command template into an argument list for one file.
         
-        if raw_escape:
-            if already_quoted:
-                # Path will be inside quotes - only escape characters that could break quotes
-                escape_map = {
-                    '"': '\\"',   # Double quote (could break double quotes)
-                    '`': '\\`',   # Backtick (command substitution)
-                    '$': '\\$',   # Dollar sign (variable expansion)
-                    '\\': '\\\\', # Backslash (escape character)
-                    '!': '\\!',   # History expansion
-                }
-            else:
-                # Path will not be inside quotes - escape all dangerous characters
-                escape_map = {
-                    # Shell metacharacters that need escaping
-                    '"': '\\"',   # Double quote
-                    "'": "\\'",   # Single quote
-                    '`': '\\`',   # Backtick
-                    '$': '\\$',   # Dollar sign (variable expansion)
-                    '\\': '\\\\', # Backslash
-                    '!': '\\!',   # History expansion
-                    
-                    # Other potentially problematic characters
-                    '&': '\\&',   # Background process
-                    '|': '\\|',   # Pipe
-                    ';': '\\;',   # Command separator
-                    '<': '\\<',   # Input redirection
-                    '>': '\\>',   # Output redirection
-                    '(': '\\(',   # Subshell start
-                    ')': '\\)',   # Subshell end
-                    '{': '\\{',   # Group start
-                    '}': '\\}',   # Group end
-                    '[': '\\[',   # Character class start
-                    ']': '\\]',   # Character class end
-                    '*': '\\*',   # Wildcard
-                    '?': '\\?',   # Wildcard
-                    '~': '\\~',   # Home directory
-                    '#': '\\#',   # Comment
-                    
-                    # Whitespace characters
-                    '\t': '\\\t', # Tab
-                    '\n': '\\\n', # Newline
-                    '\r': '\\\r', # Carriage return
-                    ' ': '\\ ',   # Space (escape when not in quotes)
-                }
+        Args:
+            input_file: Path to the input file
+            
+        Returns:
+            Argument list, including any leading NAME=value tokens from {env}
+        """
+        return [
+            token.replace(_INPUT_TOKEN, input_file) if _INPUT_TOKEN in token else token
+            for token in self._template_tokens()
+        ]
+    
+    @staticmethod
+    def _split_env_assignments(cmd_list: List[str]) -> tuple:
+        """
+        Separate leading NAME=value tokens from a command list.
+        
+        Without a shell nothing interprets "LC_ALL=C program ...", so these
+        assignments have to be passed to the child through its environment.
+        
+        Args:
+            cmd_list: Command list as returned by build_command
             
-            escaped = path
-            # Escape backslash first to avoid double-escaping
-            if '\\' in escape_map:
-                escaped = escaped.replace('\\', escape_map['\\'])
-            # Then escape all other characters
-            for char, escaped_char in escape_map.items():
-                if char != '\\':  # Skip backslash since we already handled it
-                    escaped = escaped.replace(char, escaped_char)
+        Returns:
+            Tuple of (assignments_dict, remaining_command_list)
+        """
+        assignments = {}
+        index = 0
+        # Never consume the last token, it is the program itself
+        while index < len(cmd_list) - 1:
+            name, sep, value = cmd_list[index].partition('=')
+            if not sep or not name.isidentifier():
+                break
+            assignments[name] = value
+            index += 1
+        return assignments, cmd_list[index:]
+    
+    def _render_template(self, input_file: str, args: List[str] = None) -> tuple:
+        """
+        Build the command for a file from the command template.
+        
+        Commands are always executed without a shell. Template commands are
+        tokenized like a shell would, and leading NAME=value tokens are kept
+        so the list reads like the template; process_file moves them into
+        the child environment. set_command_template selects this method as
+        _render when a template is configured.
+        
+        Args:
+            input_file: Path to the input file
+            args: Unused, templates place their own arguments
             
-            return escaped
-        else:
-            # Standard escape - use shlex.quote for complete safety
-            import shlex
-            return shlex.quote(path)
+        Returns:
+            Tuple of (command_list, use_shell, command_string)
+        """
+        cmd_list = self._split_template(input_file)
+        
+        # For display, fill the template in with the actual paths
+        try:
+            cmd_string = self.command_template.format(
+                env=self.env_vars,
+                program=self.processing_program,
+                input=input_file,
+                output_dir=self.output_directory
+            )
+        except Exception:
+            # _template_tokens has already warned about the template
+            cmd_string = f"{self.processing_program} {input_file}"
+            if self.output_directory:
+                cmd_string += f" {self.output_directory}"
+        
+        return (cmd_list, False, cmd_string)
+    
+    def _render_default(self, input_file: str, args: List[str] = None) -> tuple:
+        """
+        Build the command for a file as program, arguments, input and output directory.
+        
+        Args:
+            input_file: Path to the input file
+            args: Additional arguments for the processing program
+            
+        Returns:
+            Tuple of (command_list, use_shell, command_string)
+        """
+        # Use default command format - build list for safe execution
+        cmd_list = [self.processing_program]
+        if args:
+            cmd_list.extend(args)
+        
+        # Add input file as parameter
+        cmd_list.append(input_file)
+        
+        # Add output directory as parameter (if needed)
+        if self.output_directory:
+            cmd_list.append(self.output_directory)
+        
+        return (cmd_list, False, _join_command(cmd_list))
     
     def build_command(self, input_file: str, args: List[str] = None) -> tuple:
         """
@@ -181,53 +511,8 @@ class FileProcessor:
         Returns:
             Tuple of (command_list, use_shell)
         """
-        if self.command_template and not self.command_template.startswith("Use placeholders:"):
-            # Check if placeholders are already quoted in the template
-            input_quoted = self.is_placeholder_quoted(self.command_template, '{input}')
-            output_quoted = self.is_placeholder_quoted(self.command_template, '{output_dir}') if self.output_directory else False
-            
-            # Use custom command template with appropriately escaped parameters
-            escaped_input = self.escape_path_for_shell(input_file, raw_escape=True, already_quoted=input_quoted)
-            escaped_output = self.escape_path_for_shell(self.output_directory, raw_escape=True, already_quoted=output_quoted) if self.output_directory else ""
-            
-            # Format command template with error handling
-            try:
-                cmd_template = self.command_template.format(
-                    env=self.env_vars,
-                    program=self.processing_program,
-                    input=escaped_input,
-                    output_dir=escaped_output
-                )
-            except KeyError as e:
-                # Handle missing placeholders gracefully
-                print(f"Warning: Command template missing placeholder {e}. Using fallback command.")
-                env_prefix = f"{self.env_vars} " if self.env_vars else ""
-                cmd_template = f"{env_prefix}{self.processing_program} {escaped_input}"
-                if escaped_output:
-                    cmd_template += f" {escaped_output}"
-            except Exception as e:
-                print(f"Error formatting command template: {e}. Using fallback command.")
-                env_prefix = f"{self.env_vars} " if self.env_vars else ""
-                cmd_template = f"{env_prefix}{self.processing_program} {escaped_input}"
-                if escaped_output:
-                    cmd_template += f" {escaped_output}"
-            # For template commands, use shell=True to preserve quotes
-            return ([cmd_template], True)
-        else:
-            # Use default command format - build list for safe execution
-            cmd = [self.processing_program]
-            if args:
-                cmd.extend(args)
-            
-            # Add input file as parameter
-            cmd.append(input_file)
-            
-            # Add output directory as parameter (if needed)
-            if self.output_directory:
-                cmd.append(self.output_directory)
-            
-            # For default commands, use shell=False for security
-            return (cmd, False)
+        cmd_list, use_shell, _ = self._render(input_file, args)
+        return (cmd_list, use_shell)
     
     def build_command_string(self, input_file: str, args: List[str] = None) -> str:
         """
@@ -240,39 +525,7 @@ class FileProcessor:
         Returns:
             Command string for display
         """
-        if self.command_template and not self.command_template.startswith("Use placeholders:"):
-            # Check if placeholders are already quoted in the template
-            input_quoted = self.is_placeholder_quoted(self.command_template, '{input}')
-            output_quoted = self.is_placeholder_quoted(self.command_template, '{output_dir}') if self.output_directory else False
-            
-            # For template commands, return the formatted template with appropriately escaped paths
-            escaped_input = self.escape_path_for_shell(input_file, raw_escape=True, already_quoted=input_quoted)
-            escaped_output = self.escape_path_for_shell(self.output_directory, raw_escape=True, already_quoted=output_quoted) if self.output_directory else ""
-            
-            # Format command template with error handling
-            try:
-                return self.command_template.format(
-                    program=self.processing_program,
-                    input=escaped_input,
-                    output_dir=escaped_output
-                )
-            except KeyError as e:
-                # Handle missing placeholders gracefully
-                print(f"Warning: Command template missing placeholder {e}. Using fallback command.")
-                fallback_cmd = f"{self.processing_program} {escaped_input}"
-                if escaped_output:
-                    fallback_cmd += f" {escaped_output}"
-                return fallback_cmd
-            except Exception as e:
-                print(f"Error formatting command template: {e}. Using fallback command.")
-                fallback_cmd = f"{self.processing_program} {escaped_input}"
-                if escaped_output:
-                    fallback_cmd += f" {escaped_output}"
-                return fallback_cmd
-        else:
-            # For default commands, build and join the command list
-            cmd_list, _ = self.build_command(input_file, args)
-            return " ".join(cmd_list)
+        return self._render(input_file, args)[2]
     
     def get_subprocess_command(self, input_file: str, args: List[str] = None) -> str:
         """
@@ -286,25 +539,285 @@ class FileProcessor:
             The actual command that will be passed to subprocess
         """
         try:
-            cmd_list, use_shell = self.build_command(input_file, args)
-            
-            if use_shell:
-                # For shell commands, return the command as-is (it's already a string)
-                return cmd_list[0] if cmd_list else ""
-            else:
-                # For non-shell commands, join the list with proper quoting
-                import shlex
-                return " ".join(shlex.quote(arg) for arg in cmd_list)
+            cmd_list, _ = self.build_command(input_file, args)
+            return _join_command(cmd_list)
         except Exception as e:
             print(f"Error building subprocess command: {e}")
             # Return a simple fallback command
-            import shlex
-            safe_input = shlex.quote(input_file)
-            safe_program = shlex.quote(self.processing_program) if self.processing_program else ""
+            safe_input = self.escape_path_for_shell(input_file)
+            safe_program = self.escape_path_for_shell(self.processing_program)
             env_prefix = f"{self.env_vars} " if self.env_vars else ""
             return f"{env_prefix}{safe_program} {safe_input}"
     
         
+    def _check_process(self, process: subprocess.Popen, deadline: float) -> None:
+        """
+        Stop a running program if a stop was requested or its deadline passed.
+        
+        Args:
+            process: Running process
+            deadline: time.monotonic() value after which the process is killed
+            
+        Raises:
+            _ProcessingStopped: If stop_processing() was called
+            subprocess.TimeoutExpired: If the deadline has passed
+        """
+        if self.should_stop:
+            process.terminate()
+            try:
+                process.wait(timeout=_TERMINATE_GRACE)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+            raise _ProcessingStopped()
+        
+        if time.monotonic() > deadline:
+            process.kill()
+            process.wait()
+            raise subprocess.TimeoutExpired(process.args, self.per_file_timeout)
+    
+    def _wait_for_process(self, process: subprocess.Popen, deadline: float) -> int:
+        """
+        Wait for a program to exit while staying responsive to stop requests.
+        
+        Args:
+            process: Running process
+            deadline: time.monotonic() value after which the process is killed
+            
+        Returns:
+            The program's return code
+        """
+        while True:
+            try:
+                return process.wait(timeout=_POLL_INTERVAL)
+            except subprocess.TimeoutExpired:
+                self._check_process(process, deadline)
+    
+    def _iter_output_chunks(self, process: subprocess.Popen, deadline: float):
+        """
+        Yield raw output from a running process as it arrives.
+        
+        Both pipes are multiplexed on the calling thread with a selector. On
+        Windows, where pipes cannot be selected, each pipe is pumped by a
+        helper thread into a queue that is consumed here instead.
+        
+        Args:
+            process: Process started with stdout and stderr pipes
+            deadline: time.monotonic() value after which the process is killed
+            
+        Yields:
+            Tuples of (stream_name, data); empty data marks the end of a stream
+            
+        Raises:
+            _ProcessingStopped: If stop_processing() was called
+            subprocess.TimeoutExpired: If the pipes are still open after the deadline
+        """
+        streams = {
+            name: stream
+            for name, stream in (("stdout", process.stdout), ("stderr", process.stderr))
+            if stream
+        }
+        
+        if os.name == 'nt':
+            chunks = queue.SimpleQueue()
+            
+            def pump(name, stream):
+                for data in iter(lambda: stream.read1(_READ_SIZE), b""):
+                    chunks.put((name, data))
+                chunks.put((name, b""))
+            
+            for name, stream in streams.items():
+                threading.Thread(target=pump, args=(name, stream), daemon=True).start()
+            
+            open_streams = len(streams)
+            while open_streams:
+                self._check_process(process, deadline)
+                try:
+                    name, data = chunks.get(timeout=_POLL_INTERVAL)
+                except queue.Empty:
+                    continue
+                if not data:
+                    open_streams -= 1
+                yield name, data
+            return
+        
+        with selectors.DefaultSelector() as selector:
+            for name, stream in streams.items():
+                os.set_blocking(stream.fileno(), False)
+                selector.register(stream.fileno(), selectors.EVENT_READ, name)
+            
+            while selector.get_map():
+                self._check_process(process, deadline)
+                for key, _ in selector.select(timeout=_POLL_INTERVAL):
+                    try:
+                        data = os.read(key.fd, _READ_SIZE)
+                    except BlockingIOError:
+                        continue
+                    if not data:
+                        selector.unregister(key.fd)
+                    yield key.data, data
+    
+    def _iter_output_batches(self, process: subprocess.Popen, deadline: float):
+        """
+        Yield decoded output lines from a running process's stdout and stderr.
+        
+        Lines end at \\n, \\r\\n or a bare \\r, so progress meters that
+        redraw a single line with \\r are reported on every update. Lines are
+        yielded in batches, one per chunk read from a pipe.
+        
+        Args:
+            process: Process started with stdout and stderr pipes
+            deadline: time.monotonic() value after which the process is killed
+            
+        Yields:
+            Tuples of (stream_name, lines) with line endings stripped
+        """
+        decoders = {}
+        pending = {}
+        
+        for name, data in self._iter_output_chunks(process, deadline):
+            if name not in decoders:
+                decoders[name] = codecs.getincrementaldecoder("utf-8")(errors="replace")
+                pending[name] = ""
+            
+            text = pending[name] + decoders[name].decode(data, final=not data)
+            lines = _NEWLINE_RE.split(text)
+            tail = lines.pop()
+            
+            if data:
+                # A trailing \r may be the first half of \r\n, keep it for the next chunk
+                if text.endswith("\r") and lines:
+                    tail = lines.pop() + "\r"
+                pending[name] = tail
+            elif tail:
+                # End of stream: the unterminated last line is complete
+                lines.append(tail)
+            
+            if lines:
+                yield name, lines
+    
+    def _find_progress_candidates(self, lines: List[str]) -> set:
+        """
+        Find the lines of a batch that may contain progress information.
+        
+        A single search over the joined batch replaces searching every line;
+        only the lines it hits need the full parser.
+        
+        Args:
+            lines: Batch of output lines
+            
+        Returns:
+            Set of indexes into lines
+        """
+        # Joined with NUL rather than a newline so no pattern (\s*) can span two lines
+        text = "\0".join(lines)
+        if not _PROGRESS_RE.search(text):
+            return set()
+        
+        line_starts = []
+        offset = 0
+        for line in lines:
+            line_starts.append(offset)
+            offset += len(line) + 1
+        return {
+            bisect.bisect_right(line_starts, match.start()) - 1
+            for match in _PROGRESS_RE.finditer(text)
+        }
+    
+    def _build_env(self, env_assignments: Dict[str, str]):
+        """
+        Build the environment for the child process.
+        
+        The merged environment is cached while env_vars and the template's
+        assignments stay the same, so a batch copies os.environ only once.
+        Popen copies the mapping into the child, so sharing it is safe.
+        
+        Args:
+            env_assignments: NAME=value assignments taken from the command
+            
+        Returns:
+            Environment dictionary, or None to inherit the current environment
+        """
+        if not self.env_vars and not env_assignments:
+            return None
+        
+        signature = (self.env_vars, tuple(env_assignments.items()))
+        cached_signature, env = self._env_cache
+        if cached_signature != signature:
+            env = os.environ.copy()
+            # Parse env vars (simple key=value pairs)
+            for env_var in self.env_vars.split():
+                if '=' in env_var:
+                    key, value = env_var.split('=', 1)
+                    env[key] = value
+            env.update(env_assignments)
+            self._env_cache = (signature, env)
+        return env
+    
+    @staticmethod
+    def _call_progress_callback(progress_callback, percentage: float, line: str) -> None:
+        """
+        Invoke a progress callback; a failing callback must not abort processing.
+        
+        Args:
+            progress_callback: Callable taking (percentage, line)
+            percentage: Progress percentage (0-100)
+            line: Output line the progress was read from
+        """
+        try:
+            progress_callback(percentage, line)
+        except Exception as e:
+            print(f"Warning: Progress callback failed: {str(e)}")
+    
+    @staticmethod
+    def _stat_or_none(path: str):
+        """
+        Stat a path, returning None if it does not exist or cannot be read.
+        
+        Args:
+            path: Path to stat
+            
+        Returns:
+            os.stat_result or None
+        """
+        try:
+            return os.stat(path)
+        except OSError:
+            return None
+    
+    @staticmethod
+    def _partial_output_file(output_file: str) -> str:
+        """
+        Name the hidden file a streamed result is written to before it replaces output_file.
+        
+        The name is unique per process and thread and sits next to the output
+        file, so os.replace stays on one filesystem.
+        
+        Args:
+            output_file: Final output file path
+            
+        Returns:
+            Path of the partial output file
+        """
+        directory, name = os.path.split(output_file)
+        return os.path.join(directory, f".{name}.{os.getpid()}-{threading.get_ident()}.part")
+    
+    def _default_output_file(self, normalized_input_file: str) -> str:
+        """
+        Derive the output file path for an input file.
+        
+        Args:
+            normalized_input_file: Normalized path to the input file
+            
+        Returns:
+            "<name>_processed<ext>" in the output directory, or next to the
+            input file if no output directory is set
+        """
+        input_name, input_ext = os.path.splitext(os.path.basename(normalized_input_file))
+        # If no output directory, create output file in same directory as input
+        target_dir = self.output_directory or os.path.dirname(normalized_input_file)
+        return os.path.join(target_dir, f"{input_name}_processed{input_ext}")
+    
     def process_file(self, input_file: str, output_file: str = None, args: List[str] = None, progress_callback=None) -> Dict[str, Any]:
         """
         Process a single file using the external program.
@@ -338,16 +851,7 @@ class FileProcessor:
         
         # Determine output file path
         if not output_file:
-            input_name = os.path.splitext(os.path.basename(normalized_input_file))[0]
-            input_ext = os.path.splitext(os.path.basename(normalized_input_file))[1]
-            
-            if self.output_directory:
-                # Create output file with modified name to avoid conflict
-                output_file = os.path.join(self.output_directory, f"{input_name}_processed{input_ext}")
-            else:
-                # If no output directory, create output file in same directory as input
-                input_dir = os.path.dirname(normalized_input_file)
-                output_file = os.path.join(input_dir, f"{input_name}_processed{input_ext}")
+            output_file = self._default_output_file(normalized_input_file)
         
         # Validate output file path
         try:
@@ -381,105 +885,105 @@ class FileProcessor:
                 "output_file": output_file
             }
         
-        # Build command using template or default format
-        cmd_list, use_shell = self.build_command(normalized_input_file, args)
+        # Build the command and its display string using template or default format
+        cmd_list, use_shell, cmd_string = self._render(normalized_input_file, args)
+        
+        # A template that names stdout as its output makes stdout the result; it is
+        # streamed to a partial file that only replaces the output file on success
+        stream_stdout = bool(
+            self._streams_stdout
+            and os.path.abspath(output_file) != os.path.abspath(normalized_input_file)
+        )
+        partial_file = None
         
         try:
-            # Build command string for logging
-            cmd_string = self.build_command_string(normalized_input_file, args)
-            
             # Log the command being executed
             print(f"Executing command: {cmd_string}")
             
+            # Leading NAME=value tokens are not a program, pass them via env
+            env_assignments, cmd_list = self._split_env_assignments(cmd_list)
+            
             # Prepare environment variables
-            env = None
-            if self.env_vars:
-                env = os.environ.copy()
-                # Parse env vars (simple key=value pairs)
-                for env_var in self.env_vars.split():
-                    if '=' in env_var:
-                        key, value = env_var.split('=', 1)
-                        env[key] = value
+            env = self._build_env(env_assignments)
             
             # Run the external program with real-time output
-            process = subprocess.Popen(
-                cmd_list,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,
-                universal_newlines=True,
-                shell=use_shell,
-                env=env
-            )
+            output_handle = None
+            if stream_stdout:
+                partial_file = self._partial_output_file(output_file)
+                output_handle = os.fdopen(
+                    os.open(partial_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666), 'wb'
+                )
+            try:
+                process = subprocess.Popen(
+                    cmd_list,
+                    executable=_resolve_executable(cmd_list[0], (env or os.environ).get("PATH")),
+                    stdout=output_handle or subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    shell=use_shell,
+                    env=env,
+                    **_SPAWN_KWARGS
+                )
+            finally:
+                # The child holds its own descriptor for the file
+                if output_handle:
+                    output_handle.close()
             
             # Collect output and look for progress information
             stdout_lines = []
             stderr_lines = []
             progress_info = []
             
-            # Use threading to avoid deadlocks when reading stdout/stderr
-            def read_stdout():
-                if process.stdout:
-                    for line in iter(process.stdout.readline, ''):
-                        line = line.rstrip()
-                        stdout_lines.append(line)
-                        print(f"STDOUT: {line}")
-                        
-                        # Extract percentage from output
-                        percentage = self._extract_percentage_from_output(line)
-                        if percentage >= 0:
-                            progress_info.append({"percentage": percentage, "line": line})
-                            print(f"Progress detected: {percentage}%")
-                            
-                            # Call progress callback if provided
-                            if progress_callback:
-                                progress_callback(percentage, line)
-                        
-                        # Also parse detailed progress information
-                        progress_match = self._parse_progress_from_output(line)
-                        if progress_match:
-                            progress_info.append(progress_match)
-            
-            def read_stderr():
-                if process.stderr:
-                    for line in iter(process.stderr.readline, ''):
-                        line = line.rstrip()
-                        stderr_lines.append(line)
-                        print(f"STDERR: {line}")
-                        
-                        # Extract percentage from stderr
-                        percentage = self._extract_percentage_from_output(line)
-                        if percentage >= 0:
-                            progress_info.append({"percentage": percentage, "line": line})
-                            print(f"Progress detected: {percentage}%")
-                            
-                            # Call progress callback if provided
-                            if progress_callback:
-                                progress_callback(percentage, line)
-                        
-                        # Also parse detailed progress information
-                        progress_match = self._parse_progress_from_output(line)
-                        if progress_match:
-                            progress_info.append(progress_match)
-            
-            # Start threads for reading stdout and stderr
-            import threading
-            stdout_thread = threading.Thread(target=read_stdout)
-            stderr_thread = threading.Thread(target=read_stderr)
-            
-            stdout_thread.daemon = True
-            stderr_thread.daemon = True
-            
-            stdout_thread.start()
-            stderr_thread.start()
+            # Progress is reported at a bounded rate so a chatty program cannot flood the callback
+            last_callback_time = 0.0
+            held_update = None
             
-            # Wait for process to complete
-            return_code = process.wait(timeout=300)
+            # The deadline covers the whole run; stop requests are checked while waiting on it
+            deadline = time.monotonic() + self.per_file_timeout
             
-            # Wait for output threads to finish
-            stdout_thread.join(timeout=1.0)
-            stderr_thread.join(timeout=1.0)
+            # Both pipes are drained on this thread, so nothing else touches these lists
+            for stream_name, lines in self._iter_output_batches(process, deadline):
+                captured_lines = stdout_lines if stream_name == "stdout" else stderr_lines
+                captured_lines.extend(lines)
+                
+                if self.debug:
+                    label = stream_name.upper()
+                    for line in lines:
+                        print(f"{label}: {line}")
+                
+                latest_update = None
+                for index in sorted(self._find_progress_candidates(lines)):
+                    line = lines[index]
+                    
+                    # Extract progress from output, parsing each line only once
+                    progress = self._parse_progress_fast(line)
+                    if not progress:
+                        continue
+                    
+                    percentage = progress[0]
+                    progress_info.append({"percentage": percentage, "line": line})
+                    print(f"Progress detected: {percentage}%")
+                    latest_update = (percentage, line)
+                    
+                    # Also keep the detailed progress information
+                    progress_info.append(self._progress_details(progress, line))
+                
+                # Only the newest progress in a batch matters to the callback;
+                # call it if provided, always letting 100% through
+                if progress_callback and latest_update:
+                    now = time.monotonic()
+                    if latest_update[0] >= 100 or now - last_callback_time >= _PROGRESS_CALLBACK_INTERVAL:
+                        self._call_progress_callback(progress_callback, *latest_update)
+                        last_callback_time = now
+                        held_update = None
+                    else:
+                        held_update = latest_update
+            
+            # Deliver the latest update that was held back by the rate limit
+            if held_update:
+                self._call_progress_callback(progress_callback, *held_update)
+            
+            # Wait for process to complete
+            return_code = self._wait_for_process(process, deadline)
             
             # Combine output
             stdout = "\n".join(stdout_lines)
@@ -487,29 +991,39 @@ class FileProcessor:
             
             print(f"Command execution completed with return code: {return_code}")
             
+            if stream_stdout:
+                # Only a successful run with something on stdout replaces the output file;
+                # a failed or silent run keeps whatever an earlier run produced
+                output_stat = self._stat_or_none(partial_file)
+                if return_code == 0 and output_stat is not None and output_stat.st_size > 0:
+                    os.replace(partial_file, output_file)
+                    partial_file = None
+                else:
+                    output_stat = None
+            else:
+                # One stat answers both whether the program wrote the output file and its size
+                output_stat = self._stat_or_none(output_file)
+            final_output_exists = output_stat is not None
+            
             # Handle output file - more intelligent logic
             if return_code == 0:
-                # Check if the program created its own output file
-                output_file_exists = os.path.exists(output_file)
-                
-                if output_file_exists:
+                if output_stat is not None:
                     # Program created its own output file
-                    try:
-                        file_size = os.path.getsize(output_file)
-                        if file_size == 0:
-                            print(f"Warning: Output file exists but is empty: {output_file}")
-                        else:
-                            print(f"Output file created successfully: {output_file} ({file_size} bytes)")
-                    except Exception as e:
-                        print(f"Warning: Could not check output file size: {output_file} - {str(e)}")
+                    file_size = output_stat.st_size
+                    if file_size == 0:
+                        print(f"Warning: Output file exists but is empty: {output_file}")
+                    else:
+                        print(f"Output file created successfully: {output_file} ({file_size} bytes)")
                 elif stdout and stdout.strip():
                     # Program output to stdout, save it to output file
                     try:
                         with open(output_file, 'w', encoding='utf-8') as f:
                             f.write(stdout)
+                        final_output_exists = True
                         print(f"Saved STDOUT to output file: {output_file}")
                     except Exception as e:
                         print(f"Warning: Failed to save STDOUT to output file {output_file}: {str(e)}")
+                        final_output_exists = os.path.exists(output_file)
                 else:
                     # No output file created and no stdout
                     print(f"Info: No output file created by program")
@@ -517,18 +1031,16 @@ class FileProcessor:
             # If command failed, remove any output file that might have been created
             # Only remove if it's different from the input file and we created it
             if return_code != 0:
-                if os.path.exists(output_file) and output_file != input_file:
+                if output_stat is not None and output_file != input_file:
                     try:
                         # Only remove if it's empty or was created from stdout
-                        file_size = os.path.getsize(output_file)
-                        if file_size == 0 or (stdout and stdout.strip()):
+                        if output_stat.st_size == 0 or (stdout and stdout.strip()):
                             os.remove(output_file)
+                            final_output_exists = False
                             print(f"Removed output file due to command failure: {output_file}")
                     except Exception as e:
                         print(f"Warning: Failed to remove output file {output_file}: {str(e)}")
             
-            # Final check for output file existence
-            final_output_exists = os.path.exists(output_file)
             print(f"Final output file check: {output_file} exists: {final_output_exists}")
             
             return {
@@ -544,13 +1056,36 @@ class FileProcessor:
                 "progress_info": progress_info
             }
             
+        except _ProcessingStopped:
+            print(f"Command stopped: {cmd_string}")
+            
+            # A stopped program leaves partial output behind
+            # Only remove if it's different from the input file and the program wrote it
+            # directly; a streamed result never reached the output file
+            if not stream_stdout and output_file and os.path.exists(output_file) and output_file != input_file:
+                try:
+                    os.remove(output_file)
+                    print(f"Removed output file after stop: {output_file}")
+                except Exception as e:
+                    print(f"Warning: Failed to remove output file {output_file}: {str(e)}")
+            
+            return {
+                "success": False,
+                "error": "Processing stopped by user",
+                "input_file": normalized_input_file,
+                "output_file": output_file,
+                "output_directory": self.output_directory,
+                "output_exists": os.path.exists(output_file) if output_file else False,
+                "command": cmd_string
+            }
         except subprocess.TimeoutExpired:
             print(f"Command timed out: {cmd_string}")
-            print(f"Timeout error: Processing timed out after 300 seconds")
+            print(f"Timeout error: Processing timed out after {self.per_file_timeout} seconds")
             
             # Remove output file if it exists due to timeout
-            # Only remove if it's different from the input file
-            if output_file and os.path.exists(output_file) and output_file != input_file:
+            # Only remove if it's different from the input file and the program wrote it
+            # directly; a streamed result never reached the output file
+            if not stream_stdout and output_file and os.path.exists(output_file) and output_file != input_file:
                 try:
                     os.remove(output_file)
                     print(f"Removed output file due to timeout: {output_file}")
@@ -571,8 +1106,9 @@ class FileProcessor:
             print(f"Exception error: {str(e)}")
             
             # Remove output file if it exists due to exception
-            # Only remove if it's different from the input file
-            if output_file and os.path.exists(output_file) and output_file != input_file:
+            # Only remove if it's different from the input file and the program wrote it
+            # directly; a streamed result never reached the output file
+            if not stream_stdout and output_file and os.path.exists(output_file) and output_file != input_file:
                 try:
                     os.remove(output_file)
                     print(f"Removed output file due to exception: {output_file}")
@@ -588,8 +1124,15 @@ class FileProcessor:
                 "output_exists": os.path.exists(output_file) if output_file else False,
                 "command": cmd_string
             }
+        finally:
+            # A streamed result that never replaced the output file is discarded
+            if partial_file:
+                try:
+                    os.remove(partial_file)
+                except OSError as e:
+                    print(f"Warning: Failed to remove partial output file {partial_file}: {str(e)}")
     
-    def process_files_batch(self, files: List[str], output_dir: str = None, args: List[str] = None, progress_callback=None) -> List[Dict[str, Any]]:
+    def process_files_batch(self, files: List[str], output_dir: str = None, args: List[str] = None, progress_callback=None, use_processes: bool = False) -> List[Dict[str, Any]]:
         """
         Process multiple files in batch.
         
@@ -597,6 +1140,9 @@ class FileProcessor:
             files: List of input files
             output_dir: Output directory (optional, uses default if not provided)
             args: Additional arguments for the processing program
+            use_processes: Run each file in a worker process instead of a thread.
+                Per-line progress is not reported and a stop request only
+                cancels files that have not started.
             
         Returns:
             List of processing results
@@ -608,79 +1154,157 @@ class FileProcessor:
             self.set_output_directory(output_dir)
         
         # Store total number of files for progress tracking
-        self.total_files = len(files)
+        with self._status_lock:
+            self.total_files = len(files)
+            self.processing_results = []
+            self.is_processing = True
+            self.processed_count = 0
+            self.failed_count = 0
+            self.current_progress = 0
         print(f"Starting processing of {self.total_files} files")
         
-        results = []
-        self.processing_results = []
-        self.is_processing = True
-        self.processed_count = 0
-        self.failed_count = 0
+        # Resolve every input and output path up front so the loop only dispatches work;
+        # directory listings from an earlier batch may be out of date
+        self._dir_cache = {}
+        normalized_paths = [self.normalize_file_path(file_path) for file_path in files]
+        planned_files = [(path, self._default_output_file(path)) for path in normalized_paths]
         
-        for i, file_path in enumerate(files):
-            # Check if processing should stop
+        # Latest progress of each file, only touched under the status lock
+        file_percentages = [0.0] * len(planned_files)
+        progress_total = 0.0
+        
+        def update_file_progress(i, percentage):
+            nonlocal progress_total
+            # A file's progress only moves forward; the running total avoids summing per update
+            percentage = min(max(percentage, file_percentages[i]), 100)
+            progress_total += percentage - file_percentages[i]
+            file_percentages[i] = percentage
+            self.current_progress = progress_total / len(file_percentages)
+            return self.current_progress
+        
+        def process_planned_file(i, normalized_file_path, output_file):
+            # Files that have not started yet are skipped once a stop is requested
             if self.should_stop:
-                print("Processing stopped by user")
-                break
+                return None
             
-            # Normalize the file path
-            normalized_file_path = self.normalize_file_path(file_path)
-            self.current_file = normalized_file_path
+            with self._status_lock:
+                self.current_file = normalized_file_path
             
             # Print progress update
             print(f"Processing file {i+1}/{self.total_files}: {normalized_file_path}")
             
-            # Generate output file path
-            input_name = os.path.splitext(os.path.basename(normalized_file_path))[0]
-            input_ext = os.path.splitext(os.path.basename(normalized_file_path))[1]
-            output_file = os.path.join(self.output_directory, f"{input_name}_processed{input_ext}")
-            
             # Create file-specific progress callback
             def file_progress_callback(percentage, line):
-                # Calculate overall progress
-                file_progress = (i + percentage / 100) / len(files) * 100
-                self.current_progress = file_progress
+                # Overall progress is the mean of every file's progress, so files running
+                # side by side never move the bar backwards
+                with self._status_lock:
+                    file_progress = update_file_progress(i, percentage)
                 
                 # Call global progress callback if provided
                 if progress_callback:
                     progress_callback(file_progress, f"File {i+1}/{len(files)}: {os.path.basename(normalized_file_path)} - {line}")
             
             # Process the file with output directory and file as parameters
-            result = self.process_file(normalized_file_path, output_file, args, file_progress_callback)
-            results.append(result)
-            self.processing_results.append(result)
+            return self.process_file(normalized_file_path, output_file, args, file_progress_callback)
+        
+        def record_result(i, result):
+            # Only the batch thread records results; the lock keeps status readers consistent
+            with self._status_lock:
+                self.processing_results.append(result)
+                
+                if result["success"]:
+                    self.processed_count += 1
+                else:
+                    self.failed_count += 1
+                
+                # Store progress information from subprocess output
+                if "progress_info" in result and result["progress_info"]:
+                    self.progress_info = result["progress_info"]
+                
+                # A finished file counts as complete whatever its output last reported
+                update_file_progress(i, 100)
+                
+                # Print progress after each file
+                print(f"Progress: {self.current_progress:.1f}% ({self.processed_count + self.failed_count}/{self.total_files})")
+        
+        # Results by input index; skipped and cancelled files never get an entry
+        collected_results = {}
+        
+        def collect_result(i, future):
+            if future.cancelled():
+                return
             
-            if result["success"]:
-                self.processed_count += 1
+            error = future.exception()
+            if error is None:
+                result = future.result()
             else:
-                self.failed_count += 1
-            
-            # Store progress information from subprocess output
-            if "progress_info" in result and result["progress_info"]:
-                self.progress_info = result["progress_info"]
-                # Use the last progress info as current progress
-                last_progress = result["progress_info"][-1]
-                if "percentage" in last_progress:
-                    self.current_progress = last_progress["percentage"]
-                elif "value" in last_progress:
-                    self.current_progress = last_progress["value"]
+                # A crashed worker (e.g. a broken process pool) fails only its own file
+                normalized_file_path, output_file = planned_files[i]
+                print(f"Worker failed for {normalized_file_path}: {error}")
+                result = {
+                    "success": False,
+                    "error": f"Worker failed: {error}",
+                    "input_file": normalized_file_path,
+                    "output_file": output_file
+                }
+            
+            if result is not None:
+                collected_results[i] = result
+                record_result(i, result)
+        
+        # Each file runs its program on its own worker; max_workers bounds how many run at once
+        workers = min(self.max_workers, len(planned_files))
+        if use_processes:
+            # Worker processes rebuild a processor from these settings; callbacks,
+            # locks and caches stay in this process
+            settings = (self.processing_program, self.output_directory, self.command_template,
+                        self.env_vars, self.per_file_timeout)
+            executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+        else:
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+        
+        with executor:
+            if use_processes:
+                futures = [
+                    executor.submit(_process_file_in_worker, settings, normalized_file_path, output_file, args)
+                    for normalized_file_path, output_file in planned_files
+                ]
             else:
-                # Fallback to file count progress
-                self.current_progress = (self.processed_count + self.failed_count) / self.total_files * 100
+                futures = [
+                    executor.submit(process_planned_file, i, normalized_file_path, output_file)
+                    for i, (normalized_file_path, output_file) in enumerate(planned_files)
+                ]
             
-            # Print progress after each file
-            print(f"Progress: {self.current_progress:.1f}% ({self.processed_count + self.failed_count}/{self.total_files})")
+            future_indexes = {future: i for i, future in enumerate(futures)}
             
-            # Small delay to prevent overwhelming the system and allow GUI updates
-            time.sleep(0.2)
+            # Results are recorded here as files finish, so workers never wait on each other
+            for future in concurrent.futures.as_completed(futures):
+                collect_result(future_indexes[future], future)
+                
+                if self.should_stop:
+                    # Drop the files that have not started; running ones stop on their own
+                    for pending in futures:
+                        pending.cancel()
+                    break
         
-        self.is_processing = False
-        self.current_file = ""
+        # Files that were already running when a stop was requested finish before the pool closes
+        for i, future in enumerate(futures):
+            if i not in collected_results:
+                collect_result(i, future)
+        
+        # Results keep the order of the input files
+        results = [collected_results[i] for i in sorted(collected_results)]
+        if len(results) < len(planned_files):
+            print("Processing stopped by user")
+        
+        with self._status_lock:
+            self.is_processing = False
+            self.current_file = ""
         print(f"Processing completed. Success: {self.processed_count}, Failed: {self.failed_count}")
         
         return results
     
-    def process_files_async(self, files: List[str], output_dir: str = None, args: List[str] = None, callback=None, progress_callback=None) -> threading.Thread:
+    def process_files_async(self, files: List[str], output_dir: str = None, args: List[str] = None, callback=None, progress_callback=None, use_processes: bool = False) -> threading.Thread:
         """
         Process files asynchronously in a separate thread.
         
@@ -689,12 +1313,13 @@ class FileProcessor:
             output_dir: Output directory
             args: Additional arguments
             callback: Callback function to call when processing is complete
+            use_processes: Run each file in a worker process, see process_files_batch
             
         Returns:
             Thread object
         """
         def process_thread():
-            results = self.process_files_batch(files, output_dir, args, progress_callback)
+            results = self.process_files_batch(files, output_dir, args, progress_callback, use_processes)
             if callback:
                 callback(results)
         
@@ -711,15 +1336,18 @@ class FileProcessor:
         Returns:
             Dictionary with processing status information
         """
-        return {
-            "is_processing": self.is_processing,
-            "current_file": self.current_file,
-            "processed_count": self.processed_count,
-            "failed_count": self.failed_count,
-            "total_count": self.total_files if hasattr(self, 'total_files') else self.processed_count + self.failed_count,
-            "current_progress": getattr(self, 'current_progress', 0),
-            "progress_info": getattr(self, 'progress_info', [])
-        }
+        # Batch workers update these fields together under the status lock, so
+        # reading them under it never mixes the counts of two different files
+        with self._status_lock:
+            return {
+                "is_processing": self.is_processing,
+                "current_file": self.current_file,
+                "processed_count": self.processed_count,
+                "failed_count": self.failed_count,
+                "total_count": self.total_files if hasattr(self, 'total_files') else self.processed_count + self.failed_count,
+                "current_progress": getattr(self, 'current_progress', 0),
+                "progress_info": getattr(self, 'progress_info', [])
+            }
     
     def get_processing_results(self) -> List[Dict[str, Any]]:
         """
@@ -735,6 +1363,7 @@ class FileProcessor:
         self.processing_results = []
         self.processed_count = 0
         self.failed_count = 0
+        self._dir_cache = {}
     
     def stop_processing(self) -> None:
         """Stop the current processing."""
@@ -746,6 +1375,31 @@ class FileProcessor:
         """Reset the stop flag for new processing."""
         self.should_stop = False
     
+    def _names_without_spaces(self, dir_path: str) -> Dict[str, str]:
+        """
+        Map the entries of a directory by their names with spaces removed.
+        
+        Listings are cached until the next batch or clear_results(), so a
+        batch of near-miss paths in one folder lists it only once.
+        
+        Args:
+            dir_path: Directory to list
+            
+        Returns:
+            Dictionary of space-free name to actual name
+        """
+        names = self._dir_cache.get(dir_path)
+        if names is None:
+            names = {}
+            try:
+                with os.scandir(dir_path) as entries:
+                    for entry in entries:
+                        names.setdefault(entry.name.replace(' ', ''), entry.name)
+            except OSError as e:
+                print(f"Warning: Could not list directory {dir_path}: {str(e)}")
+            self._dir_cache[dir_path] = names
+        return names
+    
     def normalize_file_path(self, file_path: str) -> str:
         """
         Normalize file path by handling spaces and special characters.
@@ -759,136 +1413,99 @@ class FileProcessor:
         if not file_path:
             return file_path
         
-        # Remove extra spaces from the path
-        normalized = file_path.strip()
-        
-        # Handle escape sequences - convert them to actual characters
-        escape_sequences = {
-            '\\ ': ' ',      # Escaped space
-            '\\\"': '"',     # Escaped double quote
-            "\\'": "'",      # Escaped single quote
-            '\\$': '$',      # Escaped dollar sign
-            '\\\\': '\\',    # Escaped backslash
-            '\\`': '`',      # Escaped backtick
-            '\\&': '&',      # Escaped ampersand
-            '\\|': '|',      # Escaped pipe
-            '\\;': ';',      # Escaped semicolon
-            '\\<': '<',      # Escaped less than
-            '\\>': '>',      # Escaped greater than
-            '\\(': '(',      # Escaped left parenthesis
-            '\\)': ')',      # Escaped right parenthesis
-            '\\{': '{',      # Escaped left brace
-            '\\}': '}',      # Escaped right brace
-            '\\[': '[',      # Escaped left bracket
-            '\\]': ']',      # Escaped right bracket
-            '\\*': '*',      # Escaped asterisk
-            '\\?': '?',      # Escaped question mark
-            '\\~': '~',      # Escaped tilde
-            '\\#': '#',      # Escaped hash
-            '\\!': '!',      # Escaped exclamation
-            '\\t': '\t',     # Escaped tab
-            '\\n': '\n',     # Escaped newline
-            '\\r': '\r',     # Escaped carriage return
-        }
-        
-        # Process escape sequences
-        for escape_seq, actual_char in escape_sequences.items():
-            normalized = normalized.replace(escape_seq, actual_char)
-        
-        # Replace multiple spaces with single space
-        import re
-        normalized = re.sub(r'\s+', ' ', normalized)
+        # The text clean-up is cached; the file system checks below are not,
+        # since files may appear while the application runs
+        normalized = _unescape_path(file_path)
         
         # Try to find the actual file
         if not os.path.exists(normalized):
             # Try to find the file by removing extra spaces
             dir_path = os.path.dirname(normalized)
             if dir_path and os.path.exists(dir_path):
-                file_name = os.path.basename(normalized)
                 # Try to match files with similar names (ignoring extra spaces)
-                import glob
-                pattern = os.path.join(dir_path, file_name.replace(' ', '*'))
-                matches = glob.glob(pattern)
-                if matches:
-                    normalized = matches[0]
+                target = os.path.basename(normalized).replace(' ', '')
+                match = self._names_without_spaces(dir_path).get(target)
+                if match:
+                    normalized = os.path.join(dir_path, match)
         
         return normalized
     
         
-    def _parse_progress_from_output(self, line: str) -> dict:
+    def _parse_progress_fast(self, line: str) -> tuple:
         """
-        Parse progress information from subprocess output.
-        Optimized for percentage extraction.
+        Find progress information in an output line without building a dictionary.
         
         Args:
             line: Output line from subprocess
             
         Returns:
-            Dictionary with progress information or None if no progress found
+            Tuple of (percentage, current, total), where current and total are
+            None for a direct percentage, or None if no progress found
         """
-        import re
-        
-        # First, look for direct percentage patterns (most common)
-        percentage_patterns = [
-            r'(\d+)%',  # Simple percentage
-            r'progress:\s*(\d+)%',
-            r'(\d+)%\s*complete',
-            r'(\d+)%\s*done',
-            r'(\d+)%\s*processed',
-            r'(\d+)%\s*finished',
-            r'(\d+)%\s*complete',
-            r'progress\s*=\s*(\d+)%',
-            r'(\d+)%\s*complete.*',
-        ]
+        match = _PROGRESS_RE.search(line)
+        if not match:
+            return None
         
-        # Try percentage patterns first
-        for pattern in percentage_patterns:
-            match = re.search(pattern, line, re.IGNORECASE)
-            if match:
-                try:
-                    percentage = float(match.group(1))
-                    # Clamp percentage to 0-100 range
-                    percentage = max(0, min(100, percentage))
-                    return {
-                        "type": "percentage",
-                        "value": percentage,
-                        "line": line
-                    }
-                except ValueError:
-                    continue
+        # A direct percentage wins over a count, even when it comes later in the line
+        if match.group("percentage") is None and '%' in line:
+            match = _PERCENTAGE_RE.search(line, match.start()) or match
         
-        # If no direct percentage found, try count patterns
-        count_patterns = [
-            r'frame\s*(\d+)\s*of\s*(\d+)',
-            r'(\d+)\s*/\s*(\d+)',
-            r'processing\s*(\d+)\s*of\s*(\d+)',
-            r'file\s*(\d+)\s*of\s*(\d+)',
-            r'item\s*(\d+)\s*of\s*(\d+)',
-            r'task\s*(\d+)\s*of\s*(\d+)',
-            r'(\d+)\s*out\s*of\s*(\d+)',
-        ]
+        # Group 1 is the percentage in both patterns
+        if match.lastindex == 1:
+            # Clamp percentage to 0-100 range
+            return (max(0, min(100, float(match.group(1)))), None, None)
         
-        for pattern in count_patterns:
-            match = re.search(pattern, line, re.IGNORECASE)
-            if match:
-                try:
-                    current = float(match.group(1))
-                    total = float(match.group(2))
-                    if total > 0:
-                        percentage = (current / total) * 100
-                        percentage = max(0, min(100, percentage))
-                        return {
-                            "type": "count",
-                            "current": current,
-                            "total": total,
-                            "percentage": percentage,
-                            "line": line
-                        }
-                except ValueError:
-                    continue
+        # No percentage in the line, so every match from here on is a count;
+        # a zero total ("[0/0]") gives no progress and the scan moves on
+        for match in _PROGRESS_RE.finditer(line, match.start()):
+            total = float(match.group("total"))
+            if total > 0:
+                current = float(match.group("named_current") or match.group("current"))
+                percentage = max(0, min(100, (current / total) * 100))
+                return (percentage, current, total)
         
         return None
     
+    @staticmethod
+    def _progress_details(progress: tuple, line: str) -> dict:
+        """
+        Describe a result of _parse_progress_fast as a progress dictionary.
+        
+        Args:
+            progress: Tuple of (percentage, current, total)
+            line: Output line the progress was found in
+            
+        Returns:
+            Dictionary with progress information
+        """
+        percentage, current, total = progress
+        if current is None:
+            return {
+                "type": "percentage",
+                "value": percentage,
+                "line": line
+            }
+        return {
+            "type": "count",
+            "current": current,
+            "total": total,
+            "percentage": percentage,
+            "line": line
+        }
+    
+    def _parse_progress_from_output(self, line: str) -> dict:
+        """
+        Parse progress information from subprocess output.
+        
+        Args:
+            line: Output line from subprocess
+            
+        Returns:
+            Dictionary with progress information or None if no progress found
+        """
+        progress = self._parse_progress_fast(line)
+        return self._progress_details(progress, line) if progress else None
+    
     def _extract_percentage_from_output(self, line: str) -> float:
         """
         Extract percentage value from output line.
@@ -900,13 +1517,8 @@ class FileProcessor:
         Returns:
             Percentage value (0-100) or -1 if not found
         """
-        progress_info = self._parse_progress_from_output(line)
-        if progress_info:
-            if progress_info["type"] == "percentage":
-                return progress_info["value"]
-            elif progress_info["type"] == "count":
-                return progress_info["percentage"]
-        return -1
+        progress = self._parse_progress_fast(line)
+        return progress[0] if progress else -1
     
     def validate_program(self, program_path: str) -> bool:
         """
@@ -924,12 +1536,35 @@ class FileProcessor:
         # Normalize the program path first
         normalized_path = self.normalize_file_path(program_path)
         
-        # Check if the program exists
-        if not os.path.exists(normalized_path):
+        # One stat answers whether the program exists and keys the executable check
+        try:
+            program_stat = os.stat(normalized_path)
+        except OSError:
             return False
         
-        # Check if it's executable
-        if not os.access(normalized_path, os.X_OK):
+        # Directories pass os.access(X_OK) but cannot be run
+        if not stat.S_ISREG(program_stat.st_mode):
             return False
         
-        return True
\ No newline at end of file
+        # Check if it's executable
+        return _is_executable(normalized_path, program_stat.st_mtime_ns, program_stat.st_mode)
+
+
+def _process_file_in_worker(settings: tuple, input_file: str, output_file: str, args: List[str] = None) -> Dict[str, Any]:
+    """
+    Process one file in a worker process of process_files_batch.
+    
+    Args:
+        settings: Tuple of (processing_program, output_directory, command_template,
+            env_vars, per_file_timeout) taken from the batch's processor
+        input_file: Normalized input file
+        output_file: Output file planned by the batch
+        args: Additional arguments for the processing program
+        
+    Returns:
+        Processing result dictionary
+    """
+    processing_program, output_directory, command_template, env_vars, per_file_timeout = settings
+    processor = FileProcessor(processing_program, output_directory, command_template, env_vars)
+    processor.set_per_file_timeout(per_file_timeout)
+    return processor.process_file(input_file, output_file, args)
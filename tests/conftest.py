@@ -0,0 +1,92 @@
+"""
+Shared pytest fixtures for the Infini Converter tests
+"""
+
+import gc
+import os
+import sys
+import tkinter as tk
+
+import pytest
+
+# Add the src directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from infini_converter.config import Config
+
+
+def create_test_inputs(directory, count=3):
+    """Write the test{i}.txt input files the processing tests share and return their paths"""
+    test_files = []
+    for i in range(count):
+        test_file = os.path.join(directory, f'test{i}.txt')
+        with open(test_file, 'w') as f:
+            f.write(f"Test content {i}")
+        test_files.append(test_file)
+    return test_files
+
+
+def write_script(path, content):
+    """Write an executable script, fixing the mode even if a stale copy already exists"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_CLOEXEC', 0), 0o755)
+    try:
+        # The creation mode only applies to new files
+        os.fchmod(fd, 0o755)
+        os.write(fd, content.encode())
+    finally:
+        os.close(fd)
+
+
+def touch_many(dirpath, names, payload=b"x"):
+    """Create each named file under dirpath holding the same pre-encoded payload"""
+    for name in names:
+        fd = os.open(os.path.join(dirpath, name), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, payload)
+        finally:
+            os.close(fd)
+
+
+@pytest.fixture(scope="session")
+def _tk_interpreter():
+    """One hidden Tk root per session, since starting a Tk interpreter is slow"""
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        pytest.skip(f"Tk is unavailable: {e}")
+    root.withdraw()
+    yield root
+    root.destroy()
+
+
+@pytest.fixture
+def tk_root(_tk_interpreter):
+    """The shared hidden root, reset after each test so no GUI state leaks into the next one"""
+    root = _tk_interpreter
+    title = root.title()
+    yield root
+    
+    for after_id in root.tk.splitlist(root.tk.call('after', 'info')):
+        root.tk.call('after', 'cancel', after_id)
+    for sequence in root.bind():
+        root.unbind(sequence)
+    for widget in root.winfo_children():
+        widget.destroy()
+    # Dropped GUI objects release their Tcl variables and traces when collected
+    gc.collect()
+    root.title(title)
+    root.geometry("")
+
+
+@pytest.fixture(scope="session")
+def fresh_config():
+    """Configuration parsed once per session; tests that mutate it work on a deepcopy"""
+    return Config()
+
+
+@pytest.fixture(scope="session")
+def shared_testdir(tmp_path_factory):
+    """Input files built once per session; tests write their outputs to their own tmp_path"""
+    root = tmp_path_factory.mktemp("infini")
+    create_test_inputs(str(root))
+    return str(root)
@@ -9,6 +9,20 @@ import shutil
 from src.infini_converter.config import Config
 from src.infini_converter.file_discovery import FileDiscovery
 from src.infini_converter.processor import FileProcessor
+from concurrent.futures import ThreadPoolExecutor
+
+def _snapshot(directory):
+    """Map the names of the regular files in a directory to their paths, in one scandir pass"""
+    with os.scandir(directory) as entries:
+        return {entry.name: entry.path for entry in entries if entry.is_file(follow_symlinks=False)}
+
+def _write_file(path, data):
+    """Write small pre-encoded test data straight to a file descriptor"""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
 
 def test_complete_gui_workflow():
     """Test the complete GUI workflow"""
@@ -21,17 +35,13 @@ def test_complete_gui_workflow():
         os.makedirs(input_dir)
         os.makedirs(output_dir)
         
-        # Create some test files
+        # Create the test files and some existing output files concurrently
         test_files = ["test1.txt", "test2.txt", "test3.txt"]
-        for filename in test_files:
-            with open(os.path.join(input_dir, filename), 'w') as f:
-                f.write(f"Content of {filename}")
-        
-        # Create some existing output files
         existing_output_files = ["existing1.txt", "existing2.txt"]
-        for filename in existing_output_files:
-            with open(os.path.join(output_dir, filename), 'w') as f:
-                f.write(f"Existing {filename}")
+        writes = [(os.path.join(input_dir, filename), f"Content of {filename}".encode()) for filename in test_files]
+        writes += [(os.path.join(output_dir, filename), f"Existing {filename}".encode()) for filename in existing_output_files]
+        with ThreadPoolExecutor(max_workers=len(writes)) as executor:
+            list(executor.map(_write_file, *zip(*writes)))
         
         print(f"Input directory: {input_dir}")
         print(f"Output directory: {output_dir}")
@@ -50,14 +60,13 @@ def test_complete_gui_workflow():
         
         # This is what happens in process_files method
         output_placeholder_text = "Select or enter output directory path"
-        pre_files = []
+        pre_files = {}
         if output_dir and output_dir != output_placeholder_text and os.path.exists(output_dir):
             try:
-                pre_files = [os.path.join(output_dir, f) for f in os.listdir(output_dir) 
-                             if os.path.isfile(os.path.join(output_dir, f))]
+                pre_files = _snapshot(output_dir)
                 print(f"Collected {len(pre_files)} pre-processing files from output directory")
-                for f in pre_files:
-                    print(f"  - {os.path.basename(f)}")
+                for name in pre_files:
+                    print(f"  - {name}")
             except Exception as e:
                 print(f"Error reading output directory: {e}")
         
@@ -77,10 +86,9 @@ def test_complete_gui_workflow():
             print(f"  Output exists: {result['output_exists']}")
             
             # Check if output files were created after each file
-            post_files = []
+            post_files = {}
             if os.path.exists(output_dir):
-                post_files = [os.path.join(output_dir, f) for f in os.listdir(output_dir) 
-                             if os.path.isfile(os.path.join(output_dir, f))]
+                post_files = _snapshot(output_dir)
             
             print(f"  Total files after processing: {len(post_files)}")
         
@@ -88,29 +96,27 @@ def test_complete_gui_workflow():
         print(f"\n--- Simulating GUI processing_complete method ---")
         
         # Collect post-processing files list
-        post_files = []
+        post_files = {}
         if output_dir and output_dir != output_placeholder_text and os.path.exists(output_dir):
             try:
-                post_files = [os.path.join(output_dir, f) for f in os.listdir(output_dir) 
-                             if os.path.isfile(os.path.join(output_dir, f))]
+                post_files = _snapshot(output_dir)
                 print(f"Found {len(post_files)} files in output directory after processing")
-                for f in post_files:
-                    print(f"  - {os.path.basename(f)}")
+                for name in post_files:
+                    print(f"  - {name}")
             except Exception as e:
                 print(f"Error reading output directory: {e}")
         
         # Collect pre-processing files (stored before starting processing)
         pre_files = _pre_output_files
         
-        # Find new files (files in post_files but not in pre_files)
+        # Find new files (names in post_files but not in pre_files)
         new_files = []
         if pre_files and post_files:
-            pre_basenames = {os.path.basename(f) for f in pre_files}
-            for post_file in post_files:
-                post_basename = os.path.basename(post_file)
-                if post_basename not in pre_basenames:
-                    new_files.append(post_file)
-                    print(f"New file detected: {post_basename}")
+            new_files = [post_files[name] for name in post_files.keys() - pre_files.keys()]
+            # Sorted once here, both listbox simulations below display in this order
+            new_files.sort()
+            if new_files:
+                print(f"New files detected: {', '.join(os.path.basename(f) for f in new_files)}")
         
         print(f"\n--- Results ---")
         print(f"Pre-processing files: {len(pre_files)}")
@@ -120,7 +126,7 @@ def test_complete_gui_workflow():
         # Display new files in output listbox (GUI simulation)
         print(f"\n--- Output listbox content ---")
         if new_files:
-            for file_path in sorted(new_files):
+            for file_path in new_files:
                 # Display just the filename instead of full path
                 filename = os.path.basename(file_path)
                 print(f"Listbox item: {filename}")
@@ -135,7 +141,7 @@ def test_complete_gui_workflow():
         # (starting from line 866 in gui.py)
         output_listbox_items = []
         if new_files:
-            for file_path in sorted(new_files):
+            for file_path in new_files:
                 # The original code was using file_path directly (full path)
                 # output_listbox_items.append(file_path)  # This was the issue!
                 
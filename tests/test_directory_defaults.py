@@ -14,9 +14,12 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from infini_converter.gui import InfiniConverterGUI
 
-def test_directory_defaults():
+# Project directory (one level up from tests/), which the input directory defaults to
+_MAIN_PY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_directory_defaults(tk_root):
     """Test the directory default logic"""
-    root = tk.Tk()
+    root = tk_root
     root.title("Directory Default Logic Test")
     root.geometry("500x300")
     
@@ -28,8 +31,10 @@ def test_directory_defaults():
         app = InfiniConverterGUI(root)
         
         # Test 1: Check if input directory defaults to main.py location
-        main_py_dir = os.path.dirname(os.path.abspath(__file__))
-        main_py_dir = os.path.dirname(main_py_dir)  # Go up one level to the project directory
+        main_py_dir = _MAIN_PY_DIR
+        
+        # Let Tk lay out the widgets once instead of entering the event loop
+        root.update_idletasks()
         
         input_dir = app.input_directory.get()
         output_dir = app.output_directory.get()
@@ -92,7 +97,8 @@ def test_directory_defaults():
             ttk.Label(result_frame, text=result, font=("Arial", 10)).pack(anchor=tk.W, pady=2)
         
         print("\nTest completed successfully!")
-        root.mainloop()
 
 if __name__ == "__main__":
-    test_directory_defaults()
\ No newline at end of file
+    root = tk.Tk()
+    test_directory_defaults(root)
+    root.mainloop()
\ No newline at end of file
@@ -8,6 +8,7 @@ from tkinter import ttk
 import sys
 import os
 import tempfile
+import copy
 
 # Add the src directory to the path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
@@ -15,14 +16,17 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 from infini_converter.gui import InfiniConverterGUI
 from infini_converter.config import Config
 
-def test_directory_display():
+# Project directory (one level up from tests/), which the input directory defaults to
+_MAIN_PY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_directory_display(tk_root, fresh_config):
     """Test that directory boxes show default values"""
-    root = tk.Tk()
+    root = tk_root
     root.title("Directory Display Test")
     root.geometry("600x400")
     
     # Create a test with a fresh config (simulating null values)
-    test_config = Config()
+    test_config = copy.deepcopy(fresh_config)
     
     # Clear the config to test default behavior
     test_config.set_input_directory("")
@@ -35,8 +39,10 @@ def test_directory_display():
     app.config = test_config
     
     # Get the expected default values
-    main_py_dir = os.path.dirname(os.path.abspath(__file__))
-    main_py_dir = os.path.dirname(main_py_dir)  # Go up one level to the project directory
+    main_py_dir = _MAIN_PY_DIR
+    
+    # Let Tk lay out the widgets once instead of entering the event loop
+    root.update_idletasks()
     
     # Check what values are displayed
     input_display = app.input_directory.get()
@@ -72,15 +78,17 @@ def test_directory_display():
     ttk.Label(test_frame, text="", font=("Arial", 8)).pack(anchor=tk.W, pady=5)
     ttk.Label(test_frame, text="With saved config values:", font=("Arial", 10, "bold")).pack(anchor=tk.W)
     
-    # Create another instance with real config
-    app2 = InfiniConverterGUI(root)
-    real_input = app2.input_directory.get()
-    real_output = app2.output_directory.get()
+    # Reload the saved config into the same GUI instead of building a second one
+    app.config = fresh_config
+    app.input_directory.set(app.config.get_input_directory() or _MAIN_PY_DIR)
+    app.output_directory.set(app.config.get_output_directory() or app.input_directory.get())
+    real_input = app.input_directory.get()
+    real_output = app.output_directory.get()
     
     ttk.Label(test_frame, text=f"Input: {real_input}", font=("Arial", 9)).pack(anchor=tk.W, pady=1)
     ttk.Label(test_frame, text=f"Output: {real_output}", font=("Arial", 9)).pack(anchor=tk.W, pady=1)
-    
-    root.mainloop()
 
 if __name__ == "__main__":
-    test_directory_display()
\ No newline at end of file
+    root = tk.Tk()
+    test_directory_display(root, Config())
+    root.mainloop()
\ No newline at end of file
@@ -6,6 +6,7 @@ Test the fixed command structure
 import os
 import tempfile
 import shutil
+import subprocess
 from src.infini_converter.config import Config
 from src.infini_converter.file_discovery import FileDiscovery
 from src.infini_converter.processor import FileProcessor
@@ -46,7 +47,7 @@ def test_fixed_command_structure():
         
         # Test the command building
         input_path = os.path.join(input_dir, test_file)
-        cmd = processor.build_command(input_path)
+        cmd, _ = processor.build_command(input_path)
         cmd_string = " ".join(cmd)
         
         print(f"\nBuilt command: {cmd_string}")
@@ -64,15 +65,14 @@ def test_fixed_command_structure():
             command_template="echo 'Processing: {input}' -> Output: {output_dir}"
         )
         
-        cmd_echo = processor_echo.build_command(input_path)
+        cmd_echo, _ = processor_echo.build_command(input_path)
         cmd_string_echo = " ".join(cmd_echo)
         
         print(f"\nEcho test command: {cmd_string_echo}")
         
-        # Execute the echo command to test
-        import subprocess
+        # Execute the echo command to test, as an argument list without a shell
         try:
-            result = subprocess.run(cmd_string_echo, shell=True, capture_output=True, text=True, timeout=10)
+            result = subprocess.run(cmd_echo, capture_output=True, text=True, timeout=10)
             print(f"Echo command result:")
             print(f"  Return code: {result.returncode}")
             print(f"  STDOUT: {result.stdout}")
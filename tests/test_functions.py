@@ -7,6 +7,7 @@ import os
 import sys
 import tempfile
 import shutil
+import tkinter as tk
 from pathlib import Path
 
 # Add src directory to Python path
@@ -17,41 +18,60 @@ from infini_converter.logger import Logger
 from infini_converter.file_discovery import FileDiscovery
 from infini_converter.processor import FileProcessor
 
+# Contents of the discovery fixture files, pre-encoded
+_TEST_CONTENT = b"test content"
+
+# POSIX echo used as a stand-in processing program
+_ECHO = "/bin/echo"
+
+# Components and functions every InfiniConverterGUI instance must provide
+_EXPECTED_GUI_ATTRS = frozenset({
+    'config', 'logger', 'file_discovery', 'processor',
+    'input_directory', 'output_directory', 'processing_program', 'file_extensions', 'logging_enabled',
+    'browse_input_directory', 'browse_output_directory', 'browse_processing_program',
+    'process_selected_files', 'process_all_files', 'stop_processing', 'clear_file_list',
+    'save_settings', 'load_initial_settings',
+    'toggle_logging', 'log_message',
+})
+
 def test_config():
     """Test Config class functionality"""
     print("Testing Config class...")
     
-    config = Config()
-    
-    # Test file extensions
-    extensions = ['.txt', '.csv', '.json']
-    config.set_file_extensions(extensions)
-    assert config.get_file_extensions() == extensions
-    print("✓ File extensions configuration works")
-    
-    # Test output directory
-    with tempfile.TemporaryDirectory() as temp_dir:
-        config.set_output_directory(temp_dir)
-        assert config.get_output_directory() == temp_dir
-        print("✓ Output directory configuration works")
-    
-    # Test processing program
-    config.set_processing_program("/bin/echo")
-    assert config.get_processing_program() == "/bin/echo"
-    print("✓ Processing program configuration works")
-    
-    # Test logging
-    config.set_logging_enabled(True)
-    assert config.is_logging_enabled() == True
-    config.set_logging_enabled(False)
-    assert config.is_logging_enabled() == False
-    print("✓ Logging configuration works")
-    
-    # Test save and load
-    config.save_config()
-    new_config = Config()
-    assert new_config.get_file_extensions() == extensions
-    print("✓ Configuration save/load works")
+    # Keep the round trip away from the user's real config file
+    with tempfile.TemporaryDirectory() as config_dir:
+        config_file = os.path.join(config_dir, "config.json")
+        config = Config(config_file)
+        
+        # Test file extensions
+        extensions = ['.txt', '.csv', '.json']
+        config.set_file_extensions(extensions)
+        assert config.get_file_extensions() == extensions
+        print("✓ File extensions configuration works")
+        
+        # Test output directory
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config.set_output_directory(temp_dir)
+            assert config.get_output_directory() == temp_dir
+            print("✓ Output directory configuration works")
+        
+        # Test processing program
+        config.set_processing_program(_ECHO)
+        assert config.get_processing_program() == _ECHO
+        print("✓ Processing program configuration works")
+        
+        # Test logging
+        config.set_logging_enabled(True)
+        assert config.is_logging_enabled() == True
+        config.set_logging_enabled(False)
+        assert config.is_logging_enabled() == False
+        print("✓ Logging configuration works")
+        
+        # Test save and load
+        config.save_config()
+        new_config = Config(config_file)
+        assert new_config.get_file_extensions() == extensions
+        print("✓ Configuration save/load works")
 
 def test_logger():
     """Test Logger class functionality"""
@@ -98,10 +118,9 @@ def test_file_discovery():
         ]
         
         for file_path in test_files:
-            full_path = os.path.join(temp_dir, file_path)
-            os.makedirs(os.path.dirname(full_path), exist_ok=True)
-            with open(full_path, 'w') as f:
-                f.write("test content")
+            full_path = Path(temp_dir, file_path)
+            full_path.parent.mkdir(parents=True, exist_ok=True)
+            full_path.write_bytes(_TEST_CONTENT)
         
         # Test with default extensions
         discovery = FileDiscovery(['.txt', '.csv', '.json'])
@@ -139,117 +158,60 @@ def test_processor():
         os.makedirs(output_dir)
         
         # Test processor setup
-        processor = FileProcessor("/bin/echo", output_dir)
-        assert processor.processing_program == "/bin/echo"
+        processor = FileProcessor(_ECHO, output_dir)
+        assert processor.processing_program == _ECHO
         assert processor.output_directory == output_dir
         print("✓ Processor setup works")
         
         # Test program validation
-        assert processor.validate_program("/bin/echo") == True
+        assert processor.validate_program(_ECHO) == True
         assert processor.validate_program("/nonexistent/path") == False
         print("✓ Program validation works")
         
-        # Test file processing (with echo command)
-        result = processor.process_file(input_file)
+        # Test single-file, batch and error handling in one batch run (with echo command)
+        input_file2 = os.path.join(temp_dir, "test_input2.txt")
+        with open(input_file2, 'w') as f:
+            f.write("more test content")
+        input_files = [input_file, input_file2, "/nonexistent/file.txt"]
+        results = processor.process_files_batch(input_files, output_dir)
+        assert len(results) == 3
+        
+        result = results[0]
         assert result["success"] == True
         assert result["input_file"] == input_file
-        assert result["output_file"] == os.path.join(output_dir, "test_input.txt")
+        assert result["output_file"] == os.path.join(output_dir, "test_input_processed.txt")
         assert os.path.exists(result["output_file"])
         print("✓ Single file processing works")
         
-        # Test batch processing
-        processor.clear_results()
-        input_files = [input_file]
-        results = processor.process_files_batch(input_files, output_dir)
-        assert len(results) == 1
-        assert results[0]["success"] == True
-        assert processor.get_processing_status()["processed_count"] == 1
+        assert results[1]["success"] == True
+        assert processor.get_processing_status()["processed_count"] == 2
         print("✓ Batch processing works")
         
         # Test error handling - non-existent file
-        result = processor.process_file("/nonexistent/file.txt")
-        assert result["success"] == False
-        assert "not found" in result["error"]
+        assert results[2]["success"] == False
+        assert "not found" in results[2]["error"]
         print("✓ Error handling works")
 
-def test_gui_functions():
+def test_gui_functions(tk_root):
     """Test GUI-related functions"""
     print("\nTesting GUI-related functions...")
     
-    # Test that we can import and create the GUI
+    # Test that we can import and create the GUI on the shared hidden root
     try:
-        import tkinter as tk
         from src.infini_converter.gui import InfiniConverterGUI
         
-        # Create a test root window
-        root = tk.Tk()
-        root.withdraw()  # Hide the window
-        
         # Create GUI instance
-        app = InfiniConverterGUI(root)
-        
-        # Test that all components are initialized
-        assert hasattr(app, 'config')
-        assert hasattr(app, 'logger')
-        assert hasattr(app, 'file_discovery')
-        assert hasattr(app, 'processor')
-        assert hasattr(app, 'input_directory')
-        assert hasattr(app, 'output_directory')
-        assert hasattr(app, 'processing_program')
-        assert hasattr(app, 'file_extensions')
-        assert hasattr(app, 'logging_enabled')
-        
-        print("✓ GUI initialization works")
-        
-        # Test directory browsing functions exist
-        assert hasattr(app, 'browse_input_directory')
-        assert hasattr(app, 'browse_output_directory')
-        assert hasattr(app, 'browse_processing_program')
-        print("✓ Directory browsing functions exist")
-        
-        # Test file processing functions exist
-        assert hasattr(app, 'process_selected_files')
-        assert hasattr(app, 'process_all_files')
-        assert hasattr(app, 'stop_processing')
-        assert hasattr(app, 'clear_file_list')
-        print("✓ File processing functions exist")
-        
-        # Test settings functions exist
-        assert hasattr(app, 'save_settings')
-        assert hasattr(app, 'load_initial_settings')
-        print("✓ Settings functions exist")
-        
-        # Test logging functions exist
-        assert hasattr(app, 'toggle_logging')
-        assert hasattr(app, 'log_message')
-        print("✓ Logging functions exist")
-        
-        root.destroy()
-        
-    except ImportError as e:
-        print(f"✗ GUI import failed: {e}")
-    except Exception as e:
-        print(f"✗ GUI test failed: {e}")
-
-def main():
-    """Run all tests"""
-    print("=== Infini Converter Function Test Suite ===\n")
+        app = InfiniConverterGUI(tk_root)
+    except (ImportError, tk.TclError) as e:
+        print(f"✗ GUI setup failed: {e}")
+        return
     
-    try:
-        test_config()
-        test_logger()
-        test_file_discovery()
-        test_processor()
-        test_gui_functions()
-        
-        print("\n=== All Tests Completed Successfully! ===")
-        return 0
-        
-    except Exception as e:
-        print(f"\n✗ Test failed with error: {e}")
-        import traceback
-        traceback.print_exc()
-        return 1
+    # Test that all components are initialized and the GUI functions exist
+    missing = _EXPECTED_GUI_ATTRS - set(dir(app))
+    assert not missing, f"GUI is missing: {sorted(missing)}"
+    print("✓ GUI initialization works")
+    print("✓ Directory browsing, file processing, settings and logging functions exist")
 
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    import pytest
+    sys.exit(pytest.main([__file__]))
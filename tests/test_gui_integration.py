@@ -4,19 +4,32 @@ GUI integration test for Infini Converter
 """
 
 import os
+import re
 import sys
 import tempfile
 import threading
 import time
+import unittest
 
 # Add src directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 import tkinter as tk
-from tkinter import ttk, filedialog, messagebox
+
+try:
+    from tests.conftest import touch_many
+except ImportError:
+    # Run as a script, the tests directory itself is on the path
+    from conftest import touch_many
+
+# Workflow log messages, in the order test_manual_functionality writes them
+_WORKFLOW_LOG_RE = re.compile(r"Found 3 files.*Successfully processed.*Configuration saved", re.S)
 
 def test_gui_without_display():
     """Test GUI components without displaying the window"""
+    if not (os.environ.get('DISPLAY') or sys.platform in ('darwin', 'win32')):
+        raise unittest.SkipTest("no display available for Tk")
+    
     print("Testing GUI integration...")
     
     try:
@@ -36,9 +49,7 @@ def test_gui_without_display():
         with tempfile.TemporaryDirectory() as temp_dir:
             # Create test files
             test_files = ["test1.txt", "test2.csv"]
-            for filename in test_files:
-                with open(os.path.join(temp_dir, filename), 'w') as f:
-                    f.write("test content")
+            touch_many(temp_dir, test_files, b"test content")
             
             # Set input directory
             app.input_directory.set(temp_dir)
@@ -104,9 +115,7 @@ def test_manual_functionality():
             
             # Create test files
             test_files = ["file1.txt", "file2.txt", "file3.csv"]
-            for filename in test_files:
-                with open(os.path.join(input_dir, filename), 'w') as f:
-                    f.write(f"Content of {filename}")
+            touch_many(input_dir, test_files, b"Test content")
             
             # Initialize components
             config = Config()
@@ -126,7 +135,8 @@ def test_manual_functionality():
             logger.info(f"Successfully processed {successful} files")
             
             # Step 3: Verify output files
-            output_files = os.listdir(output_dir)
+            with os.scandir(output_dir) as entries:
+                output_files = [entry.name for entry in entries if entry.is_file(follow_symlinks=False)]
             assert len(output_files) == 3
             logger.info(f"Generated {len(output_files)} output files")
             
@@ -147,9 +157,7 @@ def test_manual_functionality():
             # Verify log file contains expected messages
             with open(os.path.join(temp_dir, "test.log"), 'r') as f:
                 log_content = f.read()
-                assert "Found 3 files" in log_content
-                assert "Successfully processed" in log_content
-                assert "Configuration saved" in log_content
+                assert _WORKFLOW_LOG_RE.search(log_content)
                 print("✓ Logging verification passed")
         
         return True
@@ -166,8 +174,11 @@ def main():
     
     success = True
     
-    if not test_gui_without_display():
-        success = False
+    try:
+        if not test_gui_without_display():
+            success = False
+    except unittest.SkipTest as e:
+        print(f"Skipping GUI integration test: {e}")
     
     if not test_manual_functionality():
         success = False
@@ -9,6 +9,11 @@ import shutil
 from src.infini_converter.config import Config
 from src.infini_converter.file_discovery import FileDiscovery
 from src.infini_converter.processor import FileProcessor
+try:
+    from tests.conftest import touch_many
+except ImportError:
+    # Run as a script, the tests directory itself is on the path
+    from conftest import touch_many
 
 def test_gui_output_logic():
     """Test the actual GUI logic for output files detection"""
@@ -23,15 +28,11 @@ def test_gui_output_logic():
         
         # Create some test files
         test_files = ["test1.txt", "test2.txt", "test3.txt"]
-        for filename in test_files:
-            with open(os.path.join(input_dir, filename), 'w') as f:
-                f.write(f"Content of {filename}")
+        touch_many(input_dir, test_files, b"Test content")
         
         # Create some existing output files
         existing_output_files = ["existing1.txt", "existing2.txt"]
-        for filename in existing_output_files:
-            with open(os.path.join(output_dir, filename), 'w') as f:
-                f.write(f"Existing {filename}")
+        touch_many(output_dir, existing_output_files, b"Existing output")
         
         print(f"Input directory: {input_dir}")
         print(f"Output directory: {output_dir}")
@@ -43,44 +44,41 @@ def test_gui_output_logic():
         
         # This is what happens in process_files method
         output_placeholder_text = "Select or enter output directory path"
-        pre_files = []
+        pre_names = frozenset()
         if output_dir and output_dir != output_placeholder_text and os.path.exists(output_dir):
             try:
-                pre_files = [os.path.join(output_dir, f) for f in os.listdir(output_dir) 
-                             if os.path.isfile(os.path.join(output_dir, f))]
-                print(f"Collected {len(pre_files)} pre-processing files from output directory")
-                for f in pre_files:
-                    print(f"  - {os.path.basename(f)}")
+                with os.scandir(output_dir) as it:
+                    pre_names = frozenset(e.name for e in it if e.is_file())
+                print(f"Collected {len(pre_names)} pre-processing files from output directory")
+                for name in pre_names:
+                    print(f"  - {name}")
             except Exception as e:
                 print(f"Error reading output directory: {e}")
         
-        # Store pre-processing files for comparison later
-        _pre_output_files = pre_files
+        # Store pre-processing file names for comparison later
+        _pre_output_names = pre_names
         
         # This is what happens in processing_complete method
         post_files = []
         if output_dir and output_dir != output_placeholder_text and os.path.exists(output_dir):
             try:
-                post_files = [os.path.join(output_dir, f) for f in os.listdir(output_dir) 
-                             if os.path.isfile(os.path.join(output_dir, f))]
+                with os.scandir(output_dir) as it:
+                    post_files = [e for e in it if e.is_file()]
                 print(f"Found {len(post_files)} files in output directory after processing")
             except Exception as e:
                 print(f"Error reading output directory: {e}")
         
-        # Collect pre-processing files (stored before starting processing)
-        pre_files = _pre_output_files
+        # Collect pre-processing file names (stored before starting processing)
+        pre_names = _pre_output_names
         
-        # Find new files (files in post_files but not in pre_files)
+        # Find new files (files in post_files but not in pre_names)
         new_files = []
-        if pre_files and post_files:
-            pre_basenames = {os.path.basename(f) for f in pre_files}
-            for post_file in post_files:
-                post_basename = os.path.basename(post_file)
-                if post_basename not in pre_basenames:
-                    new_files.append(post_file)
-                    print(f"New file detected: {post_file}")
+        if pre_names and post_files:
+            new_files = [e.path for e in post_files if e.name not in pre_names]
+            for new_file in new_files:
+                print(f"New file detected: {new_file}")
         
-        print(f"Pre-processing files: {len(pre_files)}")
+        print(f"Pre-processing files: {len(pre_names)}")
         print(f"Post-processing files: {len(post_files)}")
         print(f"New files detected: {len(new_files)}")
         
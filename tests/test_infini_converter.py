@@ -5,26 +5,30 @@ Unit tests for Infini Converter
 import unittest
 import tempfile
 import os
+import sys
 import json
+import threading
 from unittest.mock import Mock, patch
 
 from infini_converter.config import Config
 from infini_converter.logger import Logger
 from infini_converter.file_discovery import FileDiscovery
 from infini_converter.processor import FileProcessor
+try:
+    from tests.conftest import touch_many
+except ImportError:
+    # Run as a script, the tests directory itself is on the path
+    from conftest import touch_many
 
 
 class TestConfig(unittest.TestCase):
     def setUp(self):
-        self.temp_dir = tempfile.mkdtemp()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.temp_dir = self._tmp.name
+        self.addCleanup(self._tmp.cleanup)
         self.config_file = os.path.join(self.temp_dir, "test_config.json")
         self.config = Config(self.config_file)
     
-    def tearDown(self):
-        if os.path.exists(self.config_file):
-            os.remove(self.config_file)
-        os.rmdir(self.temp_dir)
-    
     def test_default_config(self):
         """Test that default configuration is loaded correctly."""
         self.assertIsInstance(self.config.get_file_extensions(), list)
@@ -53,15 +57,12 @@ class TestConfig(unittest.TestCase):
 
 class TestLogger(unittest.TestCase):
     def setUp(self):
-        self.temp_dir = tempfile.mkdtemp()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.temp_dir = self._tmp.name
+        self.addCleanup(self._tmp.cleanup)
         self.log_file = os.path.join(self.temp_dir, "test.log")
         self.logger = Logger(self.log_file, enabled=True)
     
-    def tearDown(self):
-        if os.path.exists(self.log_file):
-            os.remove(self.log_file)
-        os.rmdir(self.temp_dir)
-    
     def test_logger_enabled(self):
         """Test that logging works when enabled."""
         self.logger.info("Test message")
@@ -88,21 +89,27 @@ class TestLogger(unittest.TestCase):
         """Test toggling logging on and off."""
         self.logger.set_enabled(False)
         self.logger.info("This should not be logged")
+        size_before = os.path.getsize(self.log_file) if os.path.exists(self.log_file) else 0
         
         # Enable logging
         self.logger.set_enabled(True)
         self.logger.info("This should be logged")
         
+        # Content is checked in test_logger_enabled; here the file only has to grow
         self.assertTrue(os.path.exists(self.log_file))
-        with open(self.log_file, 'r') as f:
-            content = f.read()
-            self.assertIn("This should be logged", content)
+        self.assertGreater(os.path.getsize(self.log_file), size_before)
 
 
 class TestFileDiscovery(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Tests only search with it; each one gets its own directory, so the result cache never collides
+        cls.discovery = FileDiscovery([".txt", ".csv"])
+    
     def setUp(self):
-        self.temp_dir = tempfile.mkdtemp()
-        self.discovery = FileDiscovery([".txt", ".csv"])
+        self._tmp = tempfile.TemporaryDirectory()
+        self.temp_dir = self._tmp.name
+        self.addCleanup(self._tmp.cleanup)
         
         # Create test files
         self.test_files = [
@@ -112,23 +119,10 @@ class TestFileDiscovery(unittest.TestCase):
             "subdir/test4.txt"
         ]
         
-        os.makedirs(os.path.join(self.temp_dir, "subdir"))
-        
-        for file_path in self.test_files:
-            full_path = os.path.join(self.temp_dir, file_path)
-            with open(full_path, 'w') as f:
-                f.write("test content")
-    
-    def tearDown(self):
-        # Clean up test files
-        for file_path in self.test_files:
-            full_path = os.path.join(self.temp_dir, file_path)
-            if os.path.exists(full_path):
-                os.remove(full_path)
-        
-        if os.path.exists(os.path.join(self.temp_dir, "subdir")):
-            os.rmdir(os.path.join(self.temp_dir, "subdir"))
-        os.rmdir(self.temp_dir)
+        self._full_paths = [os.path.join(self.temp_dir, p) for p in self.test_files]
+        for directory in {os.path.dirname(fp) for fp in self._full_paths}:
+            os.makedirs(directory, exist_ok=True)
+        touch_many(self.temp_dir, self._full_paths, b"test content")
     
     def test_find_files(self):
         """Test finding files with specified extensions."""
@@ -148,10 +142,21 @@ class TestFileDiscovery(unittest.TestCase):
         found_basenames = [os.path.basename(f) for f in files]
         self.assertIn("test4.txt", found_basenames)
     
+    def test_find_files_sees_new_files(self):
+        """Test that a cached flat search is refreshed when the directory changes."""
+        # Age the directory so its search result is cached
+        past = os.stat(self.temp_dir).st_mtime - 60
+        os.utime(self.temp_dir, (past, past))
+        self.assertEqual(len(self.discovery.find_files(self.temp_dir, recursive=False)), 2)
+        
+        new_file = os.path.join(self.temp_dir, "test5.csv")
+        touch_many(self.temp_dir, ["test5.csv"], b"test content")
+        
+        self.assertIn(new_file, self.discovery.find_files(self.temp_dir, recursive=False))
+    
     def test_get_file_info(self):
         """Test getting file information."""
-        test_file = os.path.join(self.temp_dir, "test1.txt")
-        info = self.discovery.get_file_info(test_file)
+        info = self.discovery.get_file_info(self._full_paths[0])
         
         self.assertEqual(info["name"], "test1.txt")
         self.assertEqual(info["extension"], ".txt")
@@ -161,7 +166,9 @@ class TestFileDiscovery(unittest.TestCase):
 
 class TestFileProcessor(unittest.TestCase):
     def setUp(self):
-        self.temp_dir = tempfile.mkdtemp()
+        self._tmp = tempfile.TemporaryDirectory()
+        self.temp_dir = self._tmp.name
+        self.addCleanup(self._tmp.cleanup)
         self.output_dir = os.path.join(self.temp_dir, "output")
         os.makedirs(self.output_dir)
         
@@ -172,18 +179,6 @@ class TestFileProcessor(unittest.TestCase):
         with open(self.test_file, 'w') as f:
             f.write("test content")
     
-    def tearDown(self):
-        # Clean up
-        if os.path.exists(self.test_file):
-            os.remove(self.test_file)
-        
-        if os.path.exists(self.output_dir):
-            for file in os.listdir(self.output_dir):
-                os.remove(os.path.join(self.output_dir, file))
-            os.rmdir(self.output_dir)
-        
-        os.rmdir(self.temp_dir)
-    
     def test_set_output_directory(self):
         """Test setting output directory."""
         new_output_dir = os.path.join(self.temp_dir, "new_output")
@@ -207,20 +202,98 @@ class TestFileProcessor(unittest.TestCase):
         self.assertFalse(result["success"])
         self.assertIn("Input file not found", result["error"])
     
-    @patch('subprocess.run')
-    def test_process_file_success(self, mock_run):
-        """Test successful file processing."""
-        # Mock successful subprocess execution
-        mock_run.return_value.returncode = 0
-        mock_run.return_value.stdout = "processed content"
-        mock_run.return_value.stderr = ""
-        
+    def test_process_file_success(self):
+        """Test successful file processing with echo as the program."""
         self.processor.set_processing_program("echo")
         result = self.processor.process_file(self.test_file)
         
         self.assertTrue(result["success"])
         self.assertEqual(result["return_code"], 0)
     
+    def test_build_command_template(self):
+        """Test that template commands become argv lists without a shell."""
+        self.processor.set_processing_program("echo")
+        self.processor.set_command_template("{env} {program} -o {output_dir} {input}")
+        self.processor.set_env_vars("LC_ALL=C")
+        input_file = os.path.join(self.temp_dir, "my file & more.txt")
+        
+        cmd_list, use_shell = self.processor.build_command(input_file)
+        
+        self.assertFalse(use_shell)
+        self.assertEqual(cmd_list, ["LC_ALL=C", "echo", "-o", self.output_dir, input_file])
+    
+    def test_build_command_template_refresh(self):
+        """Test that the cached template follows configuration changes."""
+        self.processor.set_processing_program("echo")
+        self.processor.set_command_template("{program} {input} {output_dir}")
+        self.processor.build_command(self.test_file)
+        
+        self.processor.output_directory = self.temp_dir
+        cmd_list, _ = self.processor.build_command(self.test_file)
+        
+        self.assertEqual(cmd_list, ["echo", self.test_file, self.temp_dir])
+    
+    def test_build_command_template_program_with_arguments(self):
+        """Test that a program carrying its own arguments is split into tokens."""
+        self.processor.set_processing_program("sed -E ")
+        self.processor.set_command_template("{program} s/a/b/ {input}")
+        
+        cmd_list, _ = self.processor.build_command(self.test_file)
+        
+        self.assertEqual(cmd_list, ["sed", "-E", "s/a/b/", self.test_file])
+        result = self.processor.process_file(self.test_file)
+        self.assertTrue(result["success"])
+    
+    def test_parse_progress_skips_zero_total(self):
+        """Test that a count with a zero total does not hide later progress."""
+        self.assertEqual(self.processor._extract_percentage_from_output("[0/0] processing file 3 of 10"), 30)
+        self.assertEqual(self.processor._extract_percentage_from_output("[0/0] 45% done"), 45)
+        self.assertEqual(self.processor._extract_percentage_from_output("[0/0] starting"), -1)
+    
+    def test_streamed_output_replaced_only_on_success(self):
+        """Test that a failed stdout-streaming run keeps the previous output file."""
+        output_file = os.path.join(self.output_dir, "test_processed.txt")
+        touch_many(self.output_dir, ["test_processed.txt"], b"previous result")
+        self.processor.set_processing_program(sys.executable)
+        
+        self.processor.set_command_template(
+            '{program} -c "import sys; sys.stdout.write(\'partial\'); sys.exit(1)" -o - {input}'
+        )
+        result = self.processor.process_file(self.test_file, output_file)
+        
+        self.assertFalse(result["success"])
+        with open(output_file, 'rb') as f:
+            self.assertEqual(f.read(), b"previous result")
+        self.assertEqual(os.listdir(self.output_dir), ["test_processed.txt"])
+        
+        self.processor.set_command_template('{program} -c "print(\'new result\')" -o - {input}')
+        result = self.processor.process_file(self.test_file, output_file)
+        
+        self.assertTrue(result["success"])
+        with open(output_file, 'rb') as f:
+            self.assertEqual(f.read().strip(), b"new result")
+        self.assertEqual(os.listdir(self.output_dir), ["test_processed.txt"])
+    
+    def test_template_without_stdout_target_reports_progress(self):
+        """Test that stdout is still parsed for progress when the template does not name it as output."""
+        self.processor.set_processing_program(sys.executable)
+        self.processor.set_command_template('{program} -c "print(\'50% done\')" {input}')
+        reported = []
+        
+        result = self.processor.process_file(
+            self.test_file, progress_callback=lambda percentage, line: reported.append(percentage)
+        )
+        
+        self.assertTrue(result["success"])
+        self.assertEqual(reported, [50])
+    
+    def test_normalize_file_path_escapes(self):
+        """Test that escape sequences are undone in one pass without chaining."""
+        self.assertEqual(self.processor.normalize_file_path(r"my\ file\ \(1\).txt"), "my file (1).txt")
+        
+        # An escaped backslash followed by "t" is not a tab
+        self.assertEqual(self.processor.normalize_file_path(r"a\\tb.txt"), "a\\tb.txt")
+    
     def test_validate_program(self):
         """Test program validation."""
         # Test with non-existent program
@@ -232,6 +305,69 @@ class TestFileProcessor(unittest.TestCase):
             f.write("not executable")
         
         self.assertFalse(self.processor.validate_program(non_executable))
+    
+    def test_validate_program_cache_follows_mode(self):
+        """Test that cached validation is redone after a program's permissions change."""
+        program = os.path.join(self.temp_dir, "program.sh")
+        touch_many(self.temp_dir, ["program.sh"], b"#!/bin/sh\n")
+        os.chmod(program, 0o755)
+        
+        self.assertTrue(self.processor.validate_program(program))
+        self.assertTrue(self.processor.validate_program(program))
+        
+        os.chmod(program, 0o644)
+        self.assertFalse(self.processor.validate_program(program))
+    
+    def test_process_files_batch_worker_failure(self):
+        """Test that a file whose worker raises fails alone instead of aborting the batch."""
+        other_file = os.path.join(self.temp_dir, "other.txt")
+        touch_many(self.temp_dir, ["other.txt"], b"test content")
+        
+        def process_file(input_file, *args, **kwargs):
+            if input_file == self.test_file:
+                raise RuntimeError("worker crashed")
+            return {"success": True, "input_file": input_file}
+        
+        self.processor.set_processing_program("echo")
+        with patch.object(self.processor, "process_file", side_effect=process_file):
+            results = self.processor.process_files_batch([self.test_file, other_file])
+        
+        self.assertEqual([r["input_file"] for r in results], [self.test_file, other_file])
+        self.assertFalse(results[0]["success"])
+        self.assertIn("worker crashed", results[0]["error"])
+        self.assertTrue(results[1]["success"])
+        self.assertEqual((self.processor.processed_count, self.processor.failed_count), (1, 1))
+    
+    def test_process_files_batch_progress_is_monotonic(self):
+        """Test that overall progress never moves backwards while files run side by side."""
+        other_file = os.path.join(self.temp_dir, "other.txt")
+        touch_many(self.temp_dir, ["other.txt"], b"test content")
+        # The two files take turns reporting, so their updates always interleave
+        turn = threading.Condition()
+        next_turn = [0]
+        
+        def process_file(input_file, output_file=None, args=None, progress_callback=None):
+            index = 0 if input_file == self.test_file else 1
+            for percentage in (25, 50, 75, 100):
+                with turn:
+                    self.assertTrue(turn.wait_for(lambda: next_turn[0] == index, timeout=5))
+                    progress_callback(percentage, f"{percentage}%")
+                    next_turn[0] = 1 - index
+                    turn.notify_all()
+            return {"success": True, "input_file": input_file}
+        
+        reported = []
+        self.processor.set_processing_program("echo")
+        self.processor.set_max_workers(2)
+        with patch.object(self.processor, "process_file", side_effect=process_file):
+            self.processor.process_files_batch(
+                [self.test_file, other_file],
+                progress_callback=lambda percentage, message: reported.append(percentage),
+            )
+        
+        self.assertEqual(len(reported), 8)
+        self.assertEqual(reported, sorted(reported))
+        self.assertEqual(self.processor.get_processing_status()["current_progress"], 100)
 
 
 if __name__ == '__main__':
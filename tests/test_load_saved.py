@@ -13,13 +13,15 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from infini_converter.config import Config
 
+# Project directory (one level up from tests/), which the input directory defaults to
+_MAIN_PY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 def test_load_saved_functionality():
     """Test the load saved settings functionality"""
     print("=== Testing Load Saved Settings Functionality ===")
     
     # Calculate expected main.py directory
-    main_py_dir = os.path.dirname(os.path.abspath(__file__))
-    main_py_dir = os.path.dirname(main_py_dir)
+    main_py_dir = _MAIN_PY_DIR
     print(f"Expected main.py directory: {main_py_dir}")
     
     # Create fresh config
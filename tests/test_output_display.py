@@ -6,54 +6,47 @@ Test script to verify output file display fix
 import sys
 import os
 import tempfile
+import glob
 sys.path.insert(0, 'src')
 
 from infini_converter.processor import FileProcessor
 
-def test_output_file_display():
-    """Test output file display with various scenarios"""
-    print("Testing output file display...")
-    
-    # Create test files
-    test_dir = '/tmp/test_output_display'
-    os.makedirs(test_dir, exist_ok=True)
-    
-    test_files = []
-    for i in range(3):
-        test_file = os.path.join(test_dir, f'test{i}.txt')
-        with open(test_file, 'w') as f:
-            f.write(f"Test content {i}")
-        test_files.append(test_file)
-    
-    # Create a script that creates output files
-    script_content = '''#!/bin/bash
-input_file="$1"
-output_dir="$2"
-input_name=$(basename "$input_file" .txt)
-output_file="$output_dir/${input_name}_processed.txt"
+# Stand-in program that creates output files, run in the current interpreter with
+# "-c" so no script has to be written, made executable and started through bash
+_FAKE_PROGRAM = """
+import os, sys
+input_file, output_dir = sys.argv[1:3]
+input_name = os.path.splitext(os.path.basename(input_file))[0]
+output_file = os.path.join(output_dir, input_name + "_processed.txt")
+print(f"Processing {input_file}...")
+print(f"Creating output file: {output_file}")
+with open(output_file, "w") as f:
+    f.write(f"Processed content from {input_file}\\n")
+print(f"Processing completed for {input_file}")
+"""
 
-echo "Processing $input_file..."
-echo "Creating output file: $output_file"
+def _snapshot(directory):
+    """Map each entry name in a directory to whether it is a regular file, in one scandir pass"""
+    with os.scandir(directory) as entries:
+        return {entry.name: entry.is_file(follow_symlinks=False) for entry in entries}
 
-# Create output file with some content
-echo "Processed content from $input_file" > "$output_file"
-echo "Processing completed for $input_file"
-'''
+def test_output_file_display(shared_testdir, tmp_path):
+    """Test output file display with various scenarios"""
+    print("Testing output file display...")
     
-    script_file = '/tmp/test_output_script.sh'
-    with open(script_file, 'w') as f:
-        f.write(script_content)
-    os.chmod(script_file, 0o755)
+    # Inputs come from the shared test directory, outputs go to this test's own directory
+    test_files = [os.path.join(shared_testdir, f'test{i}.txt') for i in range(3)]
+    output_dir = str(tmp_path)
     
     # Test processing
     processor = FileProcessor()
-    processor.set_processing_program(script_file)
-    processor.set_output_directory(test_dir)
+    processor.set_processing_program(sys.executable)
+    processor.set_output_directory(output_dir)
     
     results = []
     for test_file in test_files:
         print(f"\nProcessing: {test_file}")
-        result = processor.process_file(test_file)
+        result = processor.process_file(test_file, args=["-c", _FAKE_PROGRAM])
         results.append(result)
         
         print(f"Result: success={result['success']}")
@@ -74,6 +67,9 @@ echo "Processing completed for $input_file"
     # Simulate GUI processing_complete logic
     output_files = []
     
+    # One scandir of the output directory answers every existence check below
+    snapshot = _snapshot(output_dir)
+    
     for i, result in enumerate(results):
         print(f"Result {i+1}: success={result['success']}, output_exists={result.get('output_exists', False)}, output_file={result.get('output_file', 'N/A')}")
         
@@ -81,10 +77,8 @@ echo "Processing completed for $input_file"
         if result["success"] and result.get("output_file"):
             output_file = result["output_file"]
             
-            # Check if file exists (either from output_exists flag or direct check)
-            file_exists = result.get("output_exists", False) or os.path.exists(output_file)
-            
-            if file_exists and os.path.exists(output_file):
+            # Check if the file is in the output directory snapshot
+            if snapshot.get(os.path.basename(output_file), False):
                 output_files.append(output_file)
                 print(f"Added output file: {output_file}")
             else:
@@ -100,12 +94,11 @@ echo "Processing completed for $input_file"
     
     # Test directory scanning
     print("\n=== Testing Directory Scanning ===")
-    import glob
     patterns = [
-        os.path.join(test_dir, "*_processed*"),
-        os.path.join(test_dir, "*.out"),
-        os.path.join(test_dir, "*.output"),
-        os.path.join(test_dir, "*.result")
+        os.path.join(output_dir, "*_processed*"),
+        os.path.join(output_dir, "*.out"),
+        os.path.join(output_dir, "*.output"),
+        os.path.join(output_dir, "*.result")
     ]
     
     found_files = []
@@ -121,12 +114,11 @@ echo "Processing completed for $input_file"
     
     print(f"\nFinal output files count: {len(output_files)}")
     
-    # Clean up
-    import shutil
-    shutil.rmtree(test_dir)
-    os.unlink(script_file)
-    
     print("\nTest completed!")
 
 if __name__ == "__main__":
-    test_output_file_display()
\ No newline at end of file
+    from conftest import create_test_inputs
+    
+    with tempfile.TemporaryDirectory() as input_dir, tempfile.TemporaryDirectory() as output_dir:
+        create_test_inputs(input_dir)
+        test_output_file_display(input_dir, output_dir)
\ No newline at end of file
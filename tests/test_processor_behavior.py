@@ -71,7 +71,8 @@ def test_processor_behavior():
         # Check what files exist in output directory
         print(f"\n--- Files in output directory ---")
         if os.path.exists(output_dir):
-            files = [f for f in os.listdir(output_dir) if os.path.isfile(os.path.join(output_dir, f))]
+            with os.scandir(output_dir) as entries:
+                files = [entry.name for entry in entries if entry.is_file(follow_symlinks=False)]
             for f in files:
                 print(f"  - {f}")
 
@@ -15,19 +15,12 @@ from tkinter import ttk
 import threading
 import time
 
-def test_progress_bar():
+def test_progress_bar(shared_testdir):
     """Test progress bar updates in the GUI"""
     print("Testing progress bar updates...")
     
-    # Create test files
-    test_dir = '/tmp/test_gui_progress'
-    os.makedirs(test_dir, exist_ok=True)
-    test_files = []
-    for i in range(3):
-        test_file = os.path.join(test_dir, f'test{i}.txt')
-        with open(test_file, 'w') as f:
-            f.write(f'Test content {i}')
-        test_files.append(test_file)
+    # Use the input files from the shared test directory
+    test_files = [os.path.join(shared_testdir, f'test{i}.txt') for i in range(3)]
     
     # Create root window
     root = tk.Tk()
@@ -109,4 +102,9 @@ def test_progress_bar():
     print("Progress bar test completed!")
 
 if __name__ == "__main__":
-    test_progress_bar()
\ No newline at end of file
+    import tempfile
+    from conftest import create_test_inputs
+    
+    with tempfile.TemporaryDirectory() as input_dir:
+        create_test_inputs(input_dir)
+        test_progress_bar(input_dir)
\ No newline at end of file
@@ -6,10 +6,16 @@ Test the actual GUI logic with realistic setup
 import os
 import tempfile
 import shutil
+import subprocess
 from src.infini_converter.config import Config
 from src.infini_converter.file_discovery import FileDiscovery
 from src.infini_converter.processor import FileProcessor
 
+def _list_files(directory):
+    """List the paths of the regular files in a directory with one scandir pass"""
+    with os.scandir(directory) as entries:
+        return [entry.path for entry in entries if entry.is_file(follow_symlinks=False)]
+
 def test_realistic_gui_processing():
     """Test with realistic GUI setup"""
     
@@ -50,8 +56,7 @@ def test_realistic_gui_processing():
         pre_files = []
         if output_dir and output_dir != output_placeholder_text and os.path.exists(output_dir):
             try:
-                pre_files = [os.path.join(output_dir, f) for f in os.listdir(output_dir) 
-                             if os.path.isfile(os.path.join(output_dir, f))]
+                pre_files = _list_files(output_dir)
                 print(f"Pre-processing files: {len(pre_files)}")
                 for f in pre_files:
                     print(f"  - {os.path.basename(f)}")
@@ -73,7 +78,6 @@ def test_realistic_gui_processing():
             print(f"Command: {cmd_string}")
             
             # Execute the command
-            import subprocess
             try:
                 result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
                 print(f"Return code: {result.returncode}")
@@ -83,8 +87,7 @@ def test_realistic_gui_processing():
                 # Check if output files were created
                 post_files = []
                 if os.path.exists(output_dir):
-                    post_files = [os.path.join(output_dir, f) for f in os.listdir(output_dir) 
-                                 if os.path.isfile(os.path.join(output_dir, f))]
+                    post_files = _list_files(output_dir)
                 
                 print(f"Files after processing {input_file}: {len(post_files)}")
                 for f in post_files:
@@ -97,8 +100,7 @@ def test_realistic_gui_processing():
         post_files = []
         if os.path.exists(output_dir):
             try:
-                post_files = [os.path.join(output_dir, f) for f in os.listdir(output_dir) 
-                             if os.path.isfile(os.path.join(output_dir, f))]
+                post_files = _list_files(output_dir)
                 print(f"\nFinal post-processing files: {len(post_files)}")
                 for f in post_files:
                     print(f"  - {os.path.basename(f)}")
@@ -135,7 +137,6 @@ def test_realistic_gui_processing():
         cmd_string = " ".join(cmd)
         print(f"New command: {cmd_string}")
         
-        import subprocess
         try:
             result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
             print(f"Return code: {result.returncode}")
@@ -143,8 +144,7 @@ def test_realistic_gui_processing():
             # Check if output files were created
             post_files = []
             if os.path.exists(output_dir):
-                post_files = [os.path.join(output_dir, f) for f in os.listdir(output_dir) 
-                             if os.path.isfile(os.path.join(output_dir, f))]
+                post_files = _list_files(output_dir)
             
             print(f"Files after processing with new template: {len(post_files)}")
             for f in post_files:
@@ -10,8 +10,13 @@ import time
 sys.path.insert(0, 'src')
 
 from infini_converter.processor import FileProcessor
+try:
+    from tests.conftest import write_script
+except ImportError:
+    # Run as a script, the tests directory itself is on the path
+    from conftest import write_script
 
-def test_realtime_progress():
+def test_realtime_progress(tmp_path):
     """Test real-time progress extraction from subprocess output"""
     print("Testing real-time progress extraction...")
     
@@ -33,15 +38,15 @@ echo "Processing 100% finished!"
 echo "All tasks completed!"
 '''
     
-    script_file = '/tmp/test_realtime_progress.sh'
-    with open(script_file, 'w') as f:
-        f.write(script_content)
-    os.chmod(script_file, 0o755)
+    # Script and output live in this test's own directory
+    script_file = os.path.join(tmp_path, 'test_realtime_progress.sh')
+    output_file = os.path.join(tmp_path, 'test_realtime_output.txt')
+    write_script(script_file, script_content)
     
     # Test processing with progress callback
     processor = FileProcessor()
     processor.set_processing_program(script_file)
-    processor.set_output_directory('/tmp')
+    processor.set_output_directory(str(tmp_path))
     
     progress_updates = []
     
@@ -55,7 +60,7 @@ echo "All tasks completed!"
     
     try:
         print("Starting file processing with real-time progress...")
-        result = processor.process_file(test_file, '/tmp/test_realtime_output.txt', progress_callback=progress_callback)
+        result = processor.process_file(test_file, output_file, progress_callback=progress_callback)
         
         print(f"\nProcessing result:")
         print(f"Success: {result['success']}")
@@ -86,9 +91,6 @@ echo "All tasks completed!"
     finally:
         # Clean up
         os.unlink(test_file)
-        os.unlink(script_file)
-        if os.path.exists('/tmp/test_realtime_output.txt'):
-            os.unlink('/tmp/test_realtime_output.txt')
 
 def test_percentage_extraction():
     """Test percentage extraction from various output formats"""
@@ -119,21 +121,13 @@ def test_percentage_extraction():
         else:
             print(f"❌ '{line}' -> No percentage found")
 
-def test_batch_progress():
+def test_batch_progress(shared_testdir, tmp_path):
     """Test batch processing with progress callbacks"""
     print("\n" + "="*50)
     print("Testing batch processing with progress callbacks...")
     
-    # Create test files
-    test_dir = '/tmp/test_batch_progress'
-    os.makedirs(test_dir, exist_ok=True)
-    
-    test_files = []
-    for i in range(3):
-        test_file = os.path.join(test_dir, f'test{i}.txt')
-        with open(test_file, 'w') as f:
-            f.write(f"Test content {i}")
-        test_files.append(test_file)
+    # Inputs come from the shared test directory, outputs go to this test's own directory
+    test_files = [os.path.join(shared_testdir, f'test{i}.txt') for i in range(3)]
     
     # Create processing script
     script_content = '''#!/bin/bash
@@ -145,15 +139,13 @@ done
 echo "Done!"
 '''
     
-    script_file = '/tmp/test_batch_script.sh'
-    with open(script_file, 'w') as f:
-        f.write(script_content)
-    os.chmod(script_file, 0o755)
+    script_file = os.path.join(tmp_path, 'test_batch_script.sh')
+    write_script(script_file, script_content)
     
     # Test batch processing
     processor = FileProcessor()
     processor.set_processing_program(script_file)
-    processor.set_output_directory(test_dir)
+    processor.set_output_directory(str(tmp_path))
     
     batch_progress_updates = []
     
@@ -165,32 +157,30 @@ echo "Done!"
         })
         print(f"📦 Batch Progress: {percentage:.1f}% - {message}")
     
-    try:
-        print("Starting batch processing...")
-        results = processor.process_files_batch(test_files, progress_callback=batch_progress_callback)
-        
-        print(f"\nBatch processing completed:")
-        print(f"Files processed: {len(results)}")
-        print(f"Successful: {sum(1 for r in results if r['success'])}")
-        print(f"Progress updates: {len(batch_progress_updates)}")
-        
-        # Show progress timeline
-        if batch_progress_updates:
-            print(f"\nBatch progress timeline:")
-            for i, update in enumerate(batch_progress_updates[:10]):  # Show first 10 updates
-                print(f"  {i+1}. {update['percentage']:5.1f}% - {update['message']}")
-            if len(batch_progress_updates) > 10:
-                print(f"  ... and {len(batch_progress_updates) - 10} more updates")
-        
-    finally:
-        # Clean up
-        import shutil
-        shutil.rmtree(test_dir)
-        os.unlink(script_file)
+    print("Starting batch processing...")
+    results = processor.process_files_batch(test_files, progress_callback=batch_progress_callback)
+    
+    print(f"\nBatch processing completed:")
+    print(f"Files processed: {len(results)}")
+    print(f"Successful: {sum(1 for r in results if r['success'])}")
+    print(f"Progress updates: {len(batch_progress_updates)}")
+    
+    # Show progress timeline
+    if batch_progress_updates:
+        print(f"\nBatch progress timeline:")
+        for i, update in enumerate(batch_progress_updates[:10]):  # Show first 10 updates
+            print(f"  {i+1}. {update['percentage']:5.1f}% - {update['message']}")
+        if len(batch_progress_updates) > 10:
+            print(f"  ... and {len(batch_progress_updates) - 10} more updates")
 
 if __name__ == "__main__":
-    test_realtime_progress()
+    with tempfile.TemporaryDirectory() as work_dir:
+        test_realtime_progress(work_dir)
     test_percentage_extraction()
-    test_batch_progress()
+    from conftest import create_test_inputs
+    
+    with tempfile.TemporaryDirectory() as input_dir, tempfile.TemporaryDirectory() as output_dir:
+        create_test_inputs(input_dir)
+        test_batch_progress(input_dir, output_dir)
     print("\n" + "="*50)
     print("All tests completed!")
\ No newline at end of file
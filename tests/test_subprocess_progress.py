@@ -10,8 +10,13 @@ import time
 sys.path.insert(0, 'src')
 
 from infini_converter.processor import FileProcessor
+try:
+    from tests.conftest import write_script
+except ImportError:
+    # Run as a script, the tests directory itself is on the path
+    from conftest import write_script
 
-def test_subprocess_progress():
+def test_subprocess_progress(tmp_path):
     """Test subprocess progress parsing"""
     print("Testing subprocess progress parsing...")
     
@@ -31,18 +36,18 @@ done
 echo "Processing complete!"
 '''
     
-    script_file = '/tmp/test_progress_script.sh'
-    with open(script_file, 'w') as f:
-        f.write(script_content)
-    os.chmod(script_file, 0o755)
+    # Script and output live in this test's own directory
+    script_file = os.path.join(tmp_path, 'test_progress_script.sh')
+    output_file = os.path.join(tmp_path, 'test_output.txt')
+    write_script(script_file, script_content)
     
     # Test processing with progress output
     processor = FileProcessor()
-    processor.set_output_directory('/tmp')
+    processor.set_output_directory(str(tmp_path))
     processor.set_processing_program(script_file)
     
     try:
-        result = processor.process_file(test_file, '/tmp/test_output.txt')
+        result = processor.process_file(test_file, output_file)
         
         print("Processing result:")
         print(f"Success: {result['success']}")
@@ -64,9 +69,6 @@ echo "Processing complete!"
     finally:
         # Clean up
         os.unlink(test_file)
-        os.unlink(script_file)
-        if os.path.exists('/tmp/test_output.txt'):
-            os.unlink('/tmp/test_output.txt')
 
 def test_output_file_display():
     """Test output file display logic"""
@@ -120,6 +122,7 @@ def test_output_file_display():
             os.unlink(test_file)
 
 if __name__ == "__main__":
-    test_subprocess_progress()
+    with tempfile.TemporaryDirectory() as work_dir:
+        test_subprocess_progress(work_dir)
     test_output_file_display()
     print("\nTest completed!")
\ No newline at end of file